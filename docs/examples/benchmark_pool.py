@@ -0,0 +1,85 @@
+import gc
+import socket
+import threading
+import time
+from luxon.http import App, Request, Response
+
+class Allocations:
+    """Counts objects created by the HTTP server and garbage collections"""
+    def __init__(self) -> None:
+        self.objects = 0
+        self.collections = 0
+        self.__patched = []
+
+        for cls in (Request, Response, Response.Status):
+            self.__count(cls)
+
+        gc.callbacks.append(self.__collected)
+
+    def __count(self, cls: type):
+        init = cls.__init__
+
+        def counted(instance, *args, **kwargs):
+            self.objects += 1
+            init(instance, *args, **kwargs)
+
+        cls.__init__ = counted
+        self.__patched.append((cls, init))
+
+    def __collected(self, phase: str, info: dict):
+        if phase == "start":
+            self.collections += 1
+
+    def close(self):
+        for cls, init in self.__patched:
+            cls.__init__ = init
+        gc.callbacks.remove(self.__collected)
+
+def run(address: tuple[str, int], count: int) -> float:
+    """Send `count` keep-alive requests one at a time and measure throughput"""
+    request = f"GET / HTTP/1.1\r\nHost: {address[0]}\r\n\r\n".encode()
+
+    def connect() -> socket.socket:
+        sock = socket.create_connection(address)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    sock = connect()
+    start = time.perf_counter()
+    for _ in range(count):
+        sock.sendall(request)
+        data = b""
+        while not data.endswith(b"Hello world!"):
+            data += sock.recv(65536)
+
+        if b"Connection: close" in data:
+            # max requests per connection reached
+            sock.close()
+            sock = connect()
+    elapsed = time.perf_counter() - start
+
+    sock.close()
+    return count / elapsed
+
+def main():
+    app = App()
+
+    @app.route("GET", "/")
+    def index(request: Request, response: Response):
+        return "Hello world!"
+
+    address = ("127.0.0.1", 8098)
+    threading.Thread(target=app.start, args=(address,), daemon=True).start()
+    time.sleep(0.5)
+
+    count = 10000
+    allocations = Allocations()
+    rate = run(address, count)
+    allocations.close()
+
+    print(f"Request/Response/Status objects per request: {allocations.objects / count:.3f}")
+    print(f"GC collections per 1000 requests: {allocations.collections * 1000 / count:.1f}")
+    print(f"Requests/sec: {rate:.0f}")
+
+if __name__ == "__main__":
+    main()
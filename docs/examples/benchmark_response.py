@@ -0,0 +1,85 @@
+import socket
+import threading
+import time
+from luxon.http import App, Request, Response
+from luxon.html.tags import *
+
+class CountingSocket:
+    """Socket wrapper that counts write syscalls"""
+    def __init__(self) -> None:
+        self.calls = 0
+        self.sent = 0
+
+    def sendall(self, data: bytes):
+        self.calls += 1
+        self.sent += len(data)
+
+    def sendmsg(self, buffers) -> int:
+        self.calls += 1
+        size = sum(len(b) for b in buffers)
+        self.sent += size
+        return size
+
+def count_writes(body: bytes) -> int:
+    """Count socket writes needed for one response"""
+    sock = CountingSocket()
+    Response(sock).write_all(body)
+    return sock.calls
+
+def response_time(body: bytes, count: int) -> float:
+    """Average time in microseconds to build and write one response"""
+    sock = CountingSocket()
+    response = Response(sock)
+
+    start = time.perf_counter()
+    for _ in range(count):
+        response.reset()
+        response.status.code = 200
+        response.write_all(body)
+    return (time.perf_counter() - start) / count * 1e6
+
+def requests_per_second(address: tuple[str, int], count: int) -> float:
+    """Send `count` keep-alive requests one at a time and measure throughput"""
+    request = f"GET / HTTP/1.1\r\nHost: {address[0]}\r\n\r\n".encode()
+
+    def connect() -> socket.socket:
+        sock = socket.create_connection(address)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    sock = connect()
+    start = time.perf_counter()
+    for _ in range(count):
+        sock.sendall(request)
+        data = b""
+        while b"</html>" not in data:
+            data += sock.recv(65536)
+
+        if b"Connection: close" in data:
+            # max requests per connection reached
+            sock.close()
+            sock = connect()
+    elapsed = time.perf_counter() - start
+
+    sock.close()
+    return count / elapsed
+
+def main():
+    page = Html().add(Body().add(H1("Hello world!"), Ul(*[f"Item {i}" for i in range(20)])))
+
+    app = App()
+
+    @app.route("GET", "/")
+    def index(request: Request, response: Response):
+        return page
+
+    address = ("127.0.0.1", 8099)
+    threading.Thread(target=app.start, args=(address,), daemon=True).start()
+    time.sleep(0.5)
+
+    print(f"Socket writes per response: {count_writes(page.html().encode())}")
+    print(f"Time per response: {response_time(page.html().encode(), 100000):.2f} us")
+    print(f"Requests/sec: {requests_per_second(address, 5000):.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import random
+import time
+from luxon.http import Router, Route
+
+def linear_match(routes: list[Route], method: str, path: str) -> Route|None:
+    """Linear scan over all routes (how routes were matched before the Router)"""
+    for route in routes:
+        if route.method != method:
+            continue
+        if route.pattern != None:
+            if route.pattern.search(path) != None:
+                return route
+        elif route.path == path:
+            return route
+    return None
+
+def main():
+    routes = []
+    for i in range(1000):
+        kind = i % 4
+        if kind == 0: routes.append(Route(method="GET", path=f"/static/page{i}", handler=i))
+        elif kind == 1: routes.append(Route(method="POST", path=f"/api/v1/resource{i}", handler=i))
+        elif kind == 2: routes.append(Route(method="GET", path=f"/users{i}/<id>/posts/<post>", handler=i))
+        else: routes.append(Route(method="GET", pattern=f"^/archive{i}/(\\d+)$", handler=i))
+
+    router = Router()
+    for route in routes:
+        router.add(route)
+    router.compile()
+
+    requests = []
+    for _ in range(2000):
+        i = random.randrange(1000)
+        kind = i % 4
+        if kind == 0: requests.append(("GET", f"/static/page{i}"))
+        elif kind == 1: requests.append(("POST", f"/api/v1/resource{i}"))
+        elif kind == 2: requests.append(("GET", f"/users{i}/42/posts/7"))
+        else: requests.append(("GET", f"/archive{i}/2024"))
+    requests.append(("GET", "/not/found"))
+
+    start = time.perf_counter()
+    for method, path in requests:
+        linear_match(routes, method, path)
+    linear = (time.perf_counter() - start) / len(requests)
+
+    start = time.perf_counter()
+    for method, path in requests:
+        router.match(method, path)
+    compiled = (time.perf_counter() - start) / len(requests)
+
+    print(f"Routes: {len(routes)}")
+    print(f"Linear scan: {linear * 1e6:.1f} us/request")
+    print(f"Router:      {compiled * 1e6:.1f} us/request")
+
+if __name__ == "__main__":
+    main()
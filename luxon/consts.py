@@ -1 +1,7 @@
-BUFFER_SIZE = 2048
\ No newline at end of file
+BUFFER_SIZE = 2048
+FILE_BUFFER_SIZE = 262144
+MAX_RANGES = 64
+COALESCE_SIZE = 16384
+MAX_HEAD_SIZE = 65536
+FORM_SPOOL_SIZE = 1048576
+FORM_MAX_FIELD_SIZE = 1048576
\ No newline at end of file
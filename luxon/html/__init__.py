@@ -1,3 +1,6 @@
 from luxon.html.tag import Tag, Root, Text
+from luxon.html.index import DocumentIndex
 from luxon.html.tags import *
-from luxon.html.parser import Parser
\ No newline at end of file
+from luxon.html.parser import Parser
+from luxon.html.xpath import XPath
+from luxon.html.pipeline import Pipeline, Field
@@ -0,0 +1,195 @@
+from __future__ import annotations
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from luxon.html.tag import Tag
+
+class DocumentIndex:
+    """Secondary index that maps id, class, tag name and attribute name to elements\n
+    Use `Tag.build_index()` or `Parser.parse(html, index=True)` to create an index.
+    Elements keep the index up to date when they are added, removed or modified.
+    """
+    def __init__(self, root: Tag):
+        """Construct a DocumentIndex
+
+        Args:
+            root (Tag): Root element of the indexed document
+        """
+        self.__root = root
+        self.__ids: dict[Any, dict[Tag, None]] = {}
+        self.__classes: dict[str, dict[Tag, None]] = {}
+        self.__tagnames: dict[str, dict[Tag, None]] = {}
+        self.__attributes: dict[str, dict[Tag, None]] = {}
+        self.__order: dict[Tag, int] = None
+
+    @property
+    def root(self) -> Tag:
+        """Root element of the indexed document"""
+        return self.__root
+
+    def add(self, tag: Tag):
+        """Add a single element to the index (children are not added)
+
+        Args:
+            tag (Tag): Element
+        """
+        if tag.tagname != None:
+            DocumentIndex.__put(self.__tagnames, tag.tagname, tag)
+
+        for attribute in tag.attributes:
+            DocumentIndex.__put(self.__attributes, attribute, tag)
+
+        id = tag.get_id()
+        if id != None:
+            DocumentIndex.__put(self.__ids, id, tag)
+
+        for class_name in tag.classes:
+            DocumentIndex.__put(self.__classes, class_name, tag)
+
+        self.__order = None
+
+    def remove(self, tag: Tag):
+        """Remove a single element from the index (children are not removed)
+
+        Args:
+            tag (Tag): Element
+        """
+        if tag.tagname != None:
+            DocumentIndex.__pop(self.__tagnames, tag.tagname, tag)
+
+        for attribute in tag.attributes:
+            DocumentIndex.__pop(self.__attributes, attribute, tag)
+
+        id = tag.get_id()
+        if id != None:
+            DocumentIndex.__pop(self.__ids, id, tag)
+
+        for class_name in tag.classes:
+            DocumentIndex.__pop(self.__classes, class_name, tag)
+
+        self.__order = None
+
+    def update_attribute(self, tag: Tag, attribute: str, old: Any, new: Any, exists: bool):
+        """Update an element's attribute in the index
+
+        Args:
+            tag (Tag): Element
+            attribute (str): Attribute name (lowercase)
+            old (Any): Previous attribute value or None
+            new (Any): New attribute value or None
+            exists (bool): True if the attribute is still set
+        """
+        if exists:
+            DocumentIndex.__put(self.__attributes, attribute, tag)
+        else:
+            DocumentIndex.__pop(self.__attributes, attribute, tag)
+
+        if attribute == "id":
+            if old != None:
+                DocumentIndex.__pop(self.__ids, old, tag)
+            if exists and new != None:
+                DocumentIndex.__put(self.__ids, new, tag)
+
+    def update_classes(self, tag: Tag, old: list[str], new: list[str]):
+        """Update an element's class list in the index
+
+        Args:
+            tag (Tag): Element
+            old (list[str]): Previous class list
+            new (list[str]): New class list
+        """
+        for class_name in old:
+            if class_name not in new:
+                DocumentIndex.__pop(self.__classes, class_name, tag)
+
+        for class_name in new:
+            DocumentIndex.__put(self.__classes, class_name, tag)
+
+    def invalidate_order(self):
+        """Mark document order as changed (called when child elements are moved)"""
+        self.__order = None
+
+    def by_id(self, id: Any) -> list[Tag]:
+        """Get elements by id (attribute) in document order
+
+        Args:
+            id (Any): ID
+
+        Returns:
+            list[Tag]: List of elements
+        """
+        return self.__sorted(self.__ids.get(id))
+
+    def by_class(self, *class_name: str) -> list[Tag]:
+        """Get elements that have all of the class names in document order
+
+        Args:
+            *class_name (str): Class name(s)
+
+        Returns:
+            list[Tag]: List of elements
+        """
+        if len(class_name) == 0: return []
+
+        buckets = sorted((self.__classes.get(name, {}) for name in class_name), key=len)
+        tags = [tag for tag in buckets[0] if all(tag in bucket for bucket in buckets[1:])]
+        return self.__sorted(tags)
+
+    def by_tagname(self, tagname: str) -> list[Tag]:
+        """Get elements by tag name in document order
+
+        Args:
+            tagname (str): Tag name
+
+        Returns:
+            list[Tag]: List of elements
+        """
+        return self.__sorted(self.__tagnames.get(tagname))
+
+    def by_attribute(self, attribute: str) -> list[Tag]:
+        """Get elements that have an attribute set in document order
+
+        Args:
+            attribute (str): Attribute name
+
+        Returns:
+            list[Tag]: List of elements
+        """
+        return self.__sorted(self.__attributes.get(attribute.lower()))
+
+    def __sorted(self, tags: dict[Tag, None]|list[Tag]|None) -> list[Tag]:
+        if not tags: return []
+        if len(tags) == 1: return list(tags)
+
+        if self.__order == None:
+            self.__order = self.__number()
+
+        order = self.__order
+        return sorted(tags, key=lambda tag: order.get(tag, -1))
+
+    def __number(self) -> dict[Tag, int]:
+        """Number elements in document order (same order as `Tag.find_all`)"""
+        order: dict[Tag, int] = {}
+        stack = [self.__root]
+
+        while len(stack) != 0:
+            tag = stack.pop()
+            order[tag] = len(order)
+            stack.extend(tag[::-1])
+
+        return order
+
+    @staticmethod
+    def __put(buckets: dict[Any, dict[Tag, None]], key: Any, tag: Tag):
+        bucket = buckets.get(key)
+        if bucket == None:
+            bucket = buckets[key] = {}
+        bucket[tag] = None
+
+    @staticmethod
+    def __pop(buckets: dict[Any, dict[Tag, None]], key: Any, tag: Tag):
+        bucket = buckets.get(key)
+        if bucket != None:
+            bucket.pop(tag, None)
+            if len(bucket) == 0:
+                del buckets[key]
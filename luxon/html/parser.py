@@ -282,11 +282,12 @@ class Parser:
         for t in tag: Parser.__strip_whitespace_text(t)
 
     @staticmethod
-    def parse(html: str) -> Tag:
+    def parse(html: str, index: bool = False) -> Tag:
         """Parse HTML source code
 
         Args:
             html (str): HTML source code
+            index (bool, optional): Build a document index for the parsed element (see `Tag.build_index`). Defaults to `False`.
 
         Raises:
             Exception: Invalid HTML source code
@@ -294,7 +295,9 @@ class Parser:
         Returns:
             Tag
         """
-        return Parser.__parse(str(html).strip(" \t\n\r"))
+        parsed = Parser.__parse(str(html).strip(" \t\n\r"))
+        if index: parsed.build_index()
+        return parsed
 
     class State(IntEnum):
         TEXT = 0
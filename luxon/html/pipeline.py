@@ -0,0 +1,156 @@
+from __future__ import annotations
+from typing import Any, Callable, Iterable, Iterator
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, Future
+import os
+from luxon.html.tag import Tag
+from luxon.html.parser import Parser
+from luxon.html.xpath import XPath
+
+class Field:
+    """Describes how a single output field is extracted from a document"""
+    def __init__(self, query: str|Callable[[Tag], bool]|type, many: bool = False, default: Any = None, convert: Callable[[Any], Any] = None):
+        """Construct a Field
+
+        Args:
+            query (str|Callable[[Tag], bool]|type): XPath expression (relative to the parsed document),
+                lambda expression or named function (see `Tag.find`) or tag type (e.g. `H2`)
+            many (bool, optional): Extract all matches as a list instead of the first match. Defaults to `False`.
+            default (Any, optional): Value used when nothing was found. Defaults to None.
+            convert (Callable[[Any], Any], optional): Called for each extracted value. Defaults to None.
+        """
+        self.__query = query
+        self.__many = many
+        self.__default = default
+        self.__convert = convert
+
+    @property
+    def query(self) -> str|Callable[[Tag], bool]|type:
+        """Field query"""
+        return self.__query
+
+    @property
+    def many(self) -> bool:
+        """Extract all matches"""
+        return self.__many
+
+    def extract(self, tag: Tag) -> Any:
+        """Extract this field from a document\n
+        Found elements are converted to their text content (see `Tag.read_text`).
+
+        Args:
+            tag (Tag): Parsed document
+
+        Returns:
+            Any: Extracted value, list of values or the default value
+        """
+        query = self.__query
+
+        if type(query) == str:
+            values = XPath.compile(query).evaluate(tag)
+            if type(values) != list: values = [values]
+        elif isinstance(query, type):
+            values = tag.find_all_by_type(query) if self.__many else [tag.find_by_type(query)]
+        elif callable(query):
+            values = tag.find_all(query) if self.__many else [tag.find(query)]
+        else:
+            raise Exception(f"Invalid field query: {query!r}")
+
+        result = []
+        for value in values:
+            if value == None: continue
+            if isinstance(value, Tag): value = value.read_text()
+            if self.__convert != None: value = self.__convert(value)
+            result.append(value)
+
+            if not self.__many: break
+
+        if self.__many:
+            return result
+        return result[0] if len(result) != 0 else self.__default
+
+class Pipeline:
+    """Declarative extraction pipeline that turns HTML documents into dicts\n
+    Each document is parsed, extracted and dropped inside a worker so only
+    the (small) extracted records are sent back from worker processes.
+
+    Hint:
+        Lambda expressions can't be sent to worker processes. Use XPath expressions,
+        named module-level functions or `processes=False` instead.
+    """
+    def __init__(self, schema: dict[str, Field|str|Callable[[Tag], bool]|type], workers: int = None, processes: bool = True, window: int = None):
+        """Construct a Pipeline
+
+        Args:
+            schema (dict[str, Field|str|Callable[[Tag], bool]|type]): Output field names mapped to fields or field queries
+            workers (int, optional): Number of workers. Defaults to None (number of CPUs). Use 1 to extract in the calling thread.
+            processes (bool, optional): Use worker processes instead of threads. Defaults to `True`.
+            window (int, optional): Max number of documents in flight. Defaults to None (4 per worker).
+        """
+        self.__schema: dict[str, Field] = {
+            name: field if isinstance(field, Field) else Field(field)
+            for name, field in schema.items()
+        }
+        self.__workers = workers if workers != None else (os.cpu_count() or 1)
+        self.__processes = processes
+        self.__window = window if window != None else self.__workers * 4
+
+    @property
+    def schema(self) -> dict[str, Field]:
+        """Output field names mapped to fields"""
+        return self.__schema
+
+    @property
+    def workers(self) -> int:
+        """Number of workers"""
+        return self.__workers
+
+    def extract(self, html: str|bytes) -> dict[str, Any]:
+        """Parse a single document and extract all fields from it
+
+        Args:
+            html (str|bytes): HTML source code
+
+        Raises:
+            Exception: Invalid HTML source code
+
+        Returns:
+            dict[str, Any]: Extracted fields
+        """
+        if type(html) == bytes:
+            html = html.decode(encoding="utf-8", errors="replace")
+
+        parsed = Parser.parse(html)
+        return {name: field.extract(parsed) for name, field in self.__schema.items()}
+
+    def run(self, documents: Iterable[str|bytes]) -> Iterator[dict[str, Any]]:
+        """Extract fields from all documents using the worker pool\n
+        Results are yielded in the same order as the documents while at most
+        `window` documents are being processed at the same time.
+
+        Args:
+            documents (Iterable[str|bytes]): HTML documents
+
+        Yields:
+            dict[str, Any]: Extracted fields of each document
+        """
+        if self.__workers <= 1:
+            for html in documents:
+                yield self.extract(html)
+            return
+
+        executor: Executor = ProcessPoolExecutor(self.__workers) if self.__processes \
+            else ThreadPoolExecutor(self.__workers)
+        pending: deque[Future] = deque()
+
+        try:
+            for html in documents:
+                pending.append(executor.submit(self.extract, html))
+
+                if len(pending) >= self.__window:
+                    yield pending.popleft().result()
+
+            while len(pending) != 0:
+                yield pending.popleft().result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
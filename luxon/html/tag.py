@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
+from luxon.html.index import DocumentIndex
 
 class Tag:
     """Base class for all HTML elements\n 
@@ -24,6 +25,7 @@ class Tag:
         self.__is_text: bool = False
         self.__hidden: bool = False
         self.__parent: Tag = None
+        self.__index: DocumentIndex = None
 
         if type(tagname) == str:
             self.__tagname = tagname.lower()
@@ -137,6 +139,24 @@ class Tag:
             Tag|None: Parent element or None if element has no parent
         """
         return self.__parent
+
+    @property
+    def index(self) -> DocumentIndex|None:
+        """Document index this element belongs to
+
+        Returns:
+            DocumentIndex|None: Document index or None if element is not indexed
+        """
+        return self.__index
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Get attributes (use `set` and `unset` to modify them)
+
+        Returns:
+            dict[str, Any]: Attributes
+        """
+        return self.__attributes
         
     @property
     def id(self) -> Any|None:
@@ -213,7 +233,20 @@ class Tag:
         Returns:
             str: Text content
         """
-        return " ".join([str(t).strip() for t in self.find_all(lambda t: type(t) == Text, recurse, max_depth)]).strip()
+        return " ".join(self.iter_text(recurse, max_depth)).strip()
+
+    def iter_text(self, recurse: bool = True, max_depth: int = None) -> Iterator[str]:
+        """Iterate over element's text content lazily in document order
+
+        Args:
+            recurse (bool, optional): Use recursion. Defaults to `True`.
+            max_depth (int, optional): Max recursion depth. Defaults to `None`.
+
+        Yields:
+            str: Stripped text of each Text element
+        """
+        for tag in self.iter_find(lambda t: type(t) == Text, recurse, max_depth):
+            yield str(tag).strip()
 
     def add(self, *tags: Tag|list[Tag|str]|str):
         """Add child elements to this element
@@ -229,6 +262,7 @@ class Tag:
             else:
                 tag.__parent = self
                 self.__tags.append(tag)
+                if self.__index != None: tag.__attach(self.__index)
 
         self.__nobody = False
         return self
@@ -254,6 +288,7 @@ class Tag:
         """
         if tag in self.__tags:
             self.__tags.remove(tag)
+            if self.__index != None: tag.__detach()
         return self
 
     def remove_all(self):
@@ -263,6 +298,8 @@ class Tag:
             self
         """
         self.nobody = True
+        if self.__index != None:
+            for tag in self.__tags: tag.__detach()
         self.__tags.clear()
         return self
 
@@ -274,6 +311,7 @@ class Tag:
             reverse (bool, optional): Reverse sort. Defaults to `False`.
         """
         self.__tags.sort(key=key, reverse=reverse)
+        if self.__index != None: self.__index.invalidate_order()
 
     def insert(self, index: int, *tags: Tag|list[Tag|str]|str):
         """Insert child elements at specific index
@@ -286,11 +324,15 @@ class Tag:
         """
         for tag in tags[::-1]:
             if type(tag) == str:
-                self.__tags.insert(index, Text(tag))
+                self.insert(index, Text(tag))
             elif type(tag) == list:
                 self.insert(index, *tag)
             else:
+                tag.__parent = self
                 self.__tags.insert(index, tag)
+                if self.__index != None: tag.__attach(self.__index)
+
+        self.__nobody = False
         return self
 
     def remove_where(self, func: Callable[[Tag], bool]):
@@ -305,6 +347,7 @@ class Tag:
         i = 0
         while i < len(self.__tags):
             if func(self.__tags[i]):
+                if self.__index != None: self.__tags[i].__detach()
                 del self.__tags[i]
                 i -= 1
             i += 1
@@ -320,7 +363,10 @@ class Tag:
         Returns:
             self
         """
-        self.__attributes[attribute.lower()] = value
+        attribute = attribute.lower()
+        old = self.__attributes.get(attribute)
+        self.__attributes[attribute] = value
+        if self.__index != None: self.__index.update_attribute(self, attribute, old, value, True)
         return self
 
     def get(self, attribute: str) -> Any|None:
@@ -349,7 +395,8 @@ class Tag:
             print("debug", attribute)
 
             if attribute in self.__attributes:
-                del self.__attributes[attribute]
+                old = self.__attributes.pop(attribute)
+                if self.__index != None: self.__index.update_attribute(self, attribute, old, None, False)
 
         return self
 
@@ -359,7 +406,9 @@ class Tag:
         Returns:
             self
         """
+        old = self.__classes
         self.__classes = [*class_names]
+        if self.__index != None: self.__index.update_classes(self, old, self.__classes)
         return self
 
     def get_classes(self) -> list[str]:
@@ -381,6 +430,7 @@ class Tag:
         """
         if class_name not in self.__classes:
             self.__classes.append(class_name)
+            if self.__index != None: self.__index.update_classes(self, [], [class_name])
         return self
 
     def unset_class(self, class_name: str):
@@ -394,6 +444,7 @@ class Tag:
         """
         if class_name in self.__classes:
             self.__classes.remove(class_name)
+            if self.__index != None: self.__index.update_classes(self, [class_name], self.__classes)
         return self
 
     def set_id(self, id: Any):
@@ -540,6 +591,72 @@ class Tag:
         Tag.__find_all(self, func, result, recurse=recurse, max_depth=max_depth)
         return result
 
+    def iter_find(self, func: Callable[[Tag], bool], recurse: bool = True, max_depth: int = None) -> Iterator[Tag]:
+        """Iterate over all elements where lambda expression or named function returns `True`.\n
+        Elements are yielded lazily in the same order as `find_all` returns them, 
+        so the search stops as soon as the caller stops iterating.
+
+        Args:
+            func (Callable[[Tag], bool]): Lambda expression or named function
+            recurse (bool, optional): Use recursion. Defaults to `True`.
+            max_depth (int, optional): Max recursion depth. Defaults to `None`.
+
+        Yields:
+            Tag: Found element
+        """
+        stack: list[tuple[Iterator[Tag], int]] = [(iter(self.__tags), 0)]
+
+        while len(stack) != 0:
+            tags, depth = stack[-1]
+            tag = next(tags, None)
+
+            if tag == None:
+                stack.pop()
+                continue
+
+            if func(tag): yield tag
+            if recurse and (max_depth == None or depth < max_depth):
+                stack.append((iter(tag.__tags), depth + 1))
+
+    def find_many(self, queries: dict[str, Callable[[Tag], bool]|type|str], recurse: bool = True, max_depth: int = None) -> dict[str, list[Tag]]:
+        """Evaluate multiple queries in a single pass over the tree.\n
+        Each query is either a lambda expression or named function, a tag type (e.g. `Div`) 
+        or a tag name (e.g. `"div"`).
+
+        Args:
+            queries (dict[str, Callable[[Tag], bool]|type|str]): Queries by name
+            recurse (bool, optional): Use recursion. Defaults to `True`.
+            max_depth (int, optional): Max recursion depth. Defaults to `None`.
+
+        Returns:
+            dict[str, list[Tag]]: List of found elements for each query name
+        """
+        results: dict[str, list[Tag]] = {}
+        checks: list[tuple[Callable[[Tag], bool], list[Tag]]] = []
+
+        for name, query in queries.items():
+            results[name] = []
+            checks.append((Tag.__compile_query(query), results[name]))
+
+        for tag in self.iter_find(lambda t: True, recurse, max_depth):
+            for func, result in checks:
+                if func(tag): result.append(tag)
+
+        return results
+
+    @staticmethod
+    def __compile_query(query: Callable[[Tag], bool]|type|str) -> Callable[[Tag], bool]:
+        """Turn a query into a lambda expression"""
+        if type(query) == str:
+            tagname = query.lower()
+            return lambda tag: tag.__tagname == tagname
+        elif isinstance(query, type):
+            return lambda tag: type(tag) == query
+        elif callable(query):
+            return query
+
+        raise Exception(f"Invalid query: {query!r}")
+
     def find_by_id(self, id: str):
         """Find element by id (attribute) recursively
 
@@ -549,6 +666,10 @@ class Tag:
         Returns:
             Tag|None: Found element or None if no element was found
         """
+        if self.__use_index(True, None):
+            result = self.__from_index(self.__index.by_id(id))
+            return result[0] if len(result) != 0 else None
+
         return self.find(lambda tag: tag.get_id() == id)
 
     def find_by_name(self, name: str, recurse: bool = True, max_depth: int = None):
@@ -592,6 +713,10 @@ class Tag:
         Returns:
             Tag|None: Found element or None if no element was found
         """
+        if self.__use_index(recurse, max_depth):
+            result = self.__from_index(self.__index.by_tagname(tagname))
+            return result[0] if len(result) != 0 else None
+
         return self.find(lambda tag: tag.__tagname == tagname, 
             recurse=recurse, 
             max_depth=max_depth)
@@ -607,6 +732,9 @@ class Tag:
         Returns:
             list[Tag]: List of found elements
         """
+        if self.__use_index(recurse, max_depth):
+            return self.__from_index(self.__index.by_tagname(tagname))
+
         return self.find_all(lambda tag: tag.__tagname == tagname, 
             recurse=recurse, 
             max_depth=max_depth)
@@ -652,6 +780,10 @@ class Tag:
         Returns:
             Tag|None: Found element or None if no element was found
         """
+        if len(class_name) != 0 and self.__use_index(recurse, max_depth):
+            result = self.__from_index(self.__index.by_class(*class_name))
+            return result[0] if len(result) != 0 else None
+
         return self.find(lambda tag: all(item in tag.__classes for item in class_name), 
             recurse=recurse, 
             max_depth=max_depth)
@@ -667,6 +799,9 @@ class Tag:
         Returns:
             list[Tag]: List of found elements
         """
+        if len(class_name) != 0 and self.__use_index(recurse, max_depth):
+            return self.__from_index(self.__index.by_class(*class_name))
+
         return self.find_all(lambda tag: all(item in tag.__classes for item in class_name), 
             recurse=recurse, 
             max_depth=max_depth)
@@ -683,6 +818,11 @@ class Tag:
         Returns:
             Tag|None: Found element or None if no element was found
         """
+        if self.__use_index(recurse, max_depth):
+            result = self.__from_index(self.__index.by_attribute(attribute), 
+                lambda tag: tag.get(attribute) == value if value != True else tag.get(attribute) != None)
+            return result[0] if len(result) != 0 else None
+
         return self.find(lambda tag: tag.get(attribute) == value if value != True else tag.get(attribute) != None, 
             recurse=recurse, 
             max_depth=max_depth)
@@ -699,10 +839,85 @@ class Tag:
         Returns:
             list[Tag]: List of found elements
         """
+        if self.__use_index(recurse, max_depth):
+            return self.__from_index(self.__index.by_attribute(attribute), 
+                lambda tag: tag.get(attribute) == value if value != True else tag.get(attribute) != None)
+
         return self.find_all(lambda tag: tag.get(attribute) == value if value != True else tag.get(attribute) != None, 
             recurse=recurse, 
             max_depth=max_depth)
 
+    def build_index(self) -> DocumentIndex:
+        """Build a document index for this element and all of it's children.\n
+        Once built, `find_by_id`, `find_by_class`, `find_by_tagname`, `find_by_attribute` 
+        and their `find_all_*` variants use the index instead of walking the tree.
+
+        Returns:
+            DocumentIndex: Document index
+        """
+        if self.__index != None:
+            return self.__index
+
+        self.__attach(DocumentIndex(self))
+        return self.__index
+
+    def drop_index(self):
+        """Drop the document index built for this element
+
+        Returns:
+            self
+        """
+        if self.__index != None and self.__index.root == self:
+            self.__detach()
+        return self
+
+    def __attach(self, index: DocumentIndex):
+        """Add this element and all of it's children to a document index"""
+        if self.__index != None and self.__index != index:
+            self.__detach()
+
+        stack: list[Tag] = [self]
+        while len(stack) != 0:
+            tag = stack.pop()
+            tag.__index = index
+            index.add(tag)
+            stack.extend(tag.__tags)
+
+    def __detach(self):
+        """Remove this element and all of it's children from their document index"""
+        index = self.__index
+        if index == None: return
+
+        stack: list[Tag] = [self]
+        while len(stack) != 0:
+            tag = stack.pop()
+            if tag.__index == index:
+                tag.__index = None
+                index.remove(tag)
+            stack.extend(tag.__tags)
+
+    def __use_index(self, recurse: bool, max_depth: int|None) -> bool:
+        """Check if a lookup can be answered from the document index"""
+        return self.__index != None and recurse and max_depth == None
+
+    def __from_index(self, tags: list[Tag], func: Callable[[Tag], bool] = None) -> list[Tag]:
+        """Filter elements returned by the document index down to this element's descendants"""
+        result = []
+        is_root = self.__index.root == self
+
+        for tag in tags:
+            if tag == self: continue
+            if func != None and not func(tag): continue
+
+            if not is_root:
+                parent = tag.__parent
+                while parent != None and parent != self:
+                    parent = parent.__parent
+                if parent == None: continue
+
+            result.append(tag)
+        return result
+
     def call(self, func: Callable[[Tag], None]):
         """Call a named method with this element as the first argument
 
@@ -774,7 +989,7 @@ class Tag:
             result += f"<{self.__tagname}" + (" " if has_props else "")
 
             # Add attributes & styles
-            attributes = self.__attributes
+            attributes = dict(self.__attributes)
 
             if len(self.__classes) > 0:
                 attributes["class"] = " ".join(self.__escape_str(x, force=True) for x in self.__classes)
@@ -848,9 +1063,18 @@ class Tag:
         return self.__tags[slice]
 
     def __setitem__(self, slice: slice, tag: Tag):
+        if self.__index != None:
+            old = self.__tags[slice]
+            for t in (old if type(old) == list else [old]): t.__detach()
         self.__tags[slice] = tag
+        if self.__index != None:
+            new = self.__tags[slice]
+            for t in (new if type(new) == list else [new]): t.__attach(self.__index)
 
     def __delitem__(self, slice: slice):  
+        if self.__index != None:
+            old = self.__tags[slice]
+            for t in (old if type(old) == list else [old]): t.__detach()
         del self.__tags[slice]
 
     # Use len() to get the length of child tags
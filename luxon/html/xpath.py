@@ -0,0 +1,754 @@
+from __future__ import annotations
+from typing import Any, Iterator
+from functools import lru_cache
+import math
+import re
+from luxon.html.tag import Tag, Root, Text
+from luxon.html.tags import Comment
+
+class XPath:
+    """Compiled XPath (subset) expression that can be evaluated against Tag trees
+
+    Supported:
+        - Absolute (`/`, `//`) and relative location paths, `.` and `..`
+        - Axes: child, descendant, descendant-or-self, self, parent, ancestor,
+          ancestor-or-self, following-sibling, preceding-sibling and attribute (`@`)
+        - Node tests: names, `*`, `node()`, `text()` and `comment()`
+        - Predicates with positions (`[1]`, `[last()]`), comparisons, `and`, `or`,
+          arithmetic, unions (`|`) and common string functions
+    """
+    def __init__(self, expression: str):
+        """Compile new XPath expression (use `XPath.compile` to reuse compiled expressions)
+
+        Args:
+            expression (str): XPath expression
+
+        Raises:
+            Exception: Invalid XPath expression
+        """
+        self.__expression = expression
+        self.__ast = XPath.Compiler(expression).compile()
+
+    @property
+    def expression(self) -> str:
+        """XPath expression"""
+        return self.__expression
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def compile(expression: str) -> XPath:
+        """Compile XPath expression or get it from the cache
+
+        Args:
+            expression (str): XPath expression
+
+        Raises:
+            Exception: Invalid XPath expression
+
+        Returns:
+            XPath
+        """
+        return XPath(expression)
+
+    @staticmethod
+    def select(tag: Tag, expression: str) -> list[Tag|str]|str|float|bool:
+        """Compile (cached) and evaluate XPath expression
+
+        Args:
+            tag (Tag): Context element
+            expression (str): XPath expression
+
+        Returns:
+            list[Tag|str]|str|float|bool: See `XPath.evaluate`
+        """
+        return XPath.compile(expression).evaluate(tag)
+
+    def evaluate(self, tag: Tag) -> list[Tag|str]|str|float|bool:
+        """Evaluate this expression with the element as context node
+
+        Args:
+            tag (Tag): Context element
+
+        Returns:
+            list[Tag|str]|str|float|bool: List of found elements in document order
+            (text nodes and attributes are returned as strings) or value of a scalar expression
+        """
+        value = XPath.__eval(self.__ast, tag, 1, 1, XPath.State())
+
+        if type(value) != list:
+            return value
+
+        result = []
+        for node in value:
+            if type(node) == Text: node = str(node.text)
+            elif type(node) == XPath.Document: node = node.top
+            result.append(node)
+        return result
+
+    def first(self, tag: Tag) -> Tag|str|None:
+        """Evaluate this expression and return the first result
+
+        Args:
+            tag (Tag): Context element
+
+        Returns:
+            Tag|str|None: First result or None if nothing was found
+        """
+        result = self.evaluate(tag)
+        if type(result) != list:
+            return result
+        return result[0] if len(result) != 0 else None
+
+    @staticmethod
+    def __eval(expr: tuple, node: Any, position: int, size: int, state: XPath.State) -> Any:
+        kind = expr[0]
+
+        if kind == "num" or kind == "str":
+            return expr[1]
+
+        elif kind == "path":
+            return XPath.__eval_path(expr, node, state)
+
+        elif kind == "union":
+            nodes = {}
+            for path in expr[1]:
+                value = XPath.__eval(path, node, position, size, state)
+                if type(value) != list:
+                    raise Exception("Union operands must be node-sets")
+                for n in value: nodes[n] = None
+            return state.sort(list(nodes))
+
+        elif kind == "neg":
+            return -XPath.__number(XPath.__eval(expr[1], node, position, size, state))
+
+        elif kind == "call":
+            return XPath.__call(expr[1], expr[2], node, position, size, state)
+
+        # Binary operators
+        op, left = expr[1], expr[2]
+
+        if op == "or":
+            return XPath.__boolean(XPath.__eval(left, node, position, size, state)) \
+                or XPath.__boolean(XPath.__eval(expr[3], node, position, size, state))
+        elif op == "and":
+            return XPath.__boolean(XPath.__eval(left, node, position, size, state)) \
+                and XPath.__boolean(XPath.__eval(expr[3], node, position, size, state))
+
+        a = XPath.__eval(left, node, position, size, state)
+        b = XPath.__eval(expr[3], node, position, size, state)
+
+        if op in COMPARISONS:
+            return XPath.__compare(op, a, b)
+
+        a, b = XPath.__number(a), XPath.__number(b)
+        if op == "+": return a + b
+        if op == "-": return a - b
+        if op == "*": return a * b
+        if op == "div": return a / b if b != 0 else (math.nan if a == 0 else math.copysign(math.inf, a) * math.copysign(1, b))
+        if op == "mod": return math.fmod(a, b) if b != 0 else math.nan
+
+        raise Exception(f"Unknown operator: {op}")
+
+    @staticmethod
+    def __eval_path(expr: tuple, node: Any, state: XPath.State) -> list:
+        start, steps = expr[1], expr[2]
+
+        if start == None:
+            nodes, ordered, flat = [node], True, True
+        elif start == "/":
+            nodes, ordered, flat = [XPath.__document(node)], True, True
+        else:
+            # Filter expression e.g. (//a)[1]
+            nodes = XPath.__eval(start[1], node, 1, 1, state)
+            if type(nodes) != list:
+                if len(steps) == 0 and len(start[2]) == 0: return nodes
+                raise Exception("Filter expression must be a node-set")
+            nodes = state.sort(nodes)
+            for predicate in start[2]:
+                nodes = XPath.__filter(predicate, nodes, state)
+            ordered, flat = True, False
+
+        for step in steps:
+            if len(nodes) == 0: break
+            nodes, ordered, flat = XPath.__step(step, nodes, ordered, flat, state)
+
+        if not ordered:
+            nodes = state.sort(nodes)
+
+        return nodes
+
+    @staticmethod
+    def __step(step: tuple, nodes: list, ordered: bool, flat: bool, state: XPath.State) -> tuple[list, bool, bool]:
+        axis, test, predicates, positional = step
+
+        if axis == "attribute":
+            result = []
+            for node in nodes:
+                values = XPath.__attribute_values(node, test)
+                for predicate in predicates:
+                    values = XPath.__filter(predicate, values, state)
+                result.extend(values)
+            return result, ordered, flat
+
+        # Subtrees walked for one context node don't have to be walked again
+        # for it's descendants unless predicates depend on the position
+        walked = set() if axis in DESCENDANT_AXES and not positional else None
+        result: dict[Any, None] = {}
+
+        for node in nodes:
+            if walked != None and node in walked: continue
+
+            candidates = [t for t in XPath.__axis(axis, node, walked) if XPath.__test(t, test)]
+            for predicate in predicates:
+                candidates = XPath.__filter(predicate, candidates, state)
+
+            if axis in REVERSE_AXES:
+                candidates.reverse()
+
+            for t in candidates: result[t] = None
+
+        nodes_out = list(result)
+
+        if len(nodes) == 1:
+            return nodes_out, True, axis in FLAT_AXES
+        if ordered and (walked != None or axis == "self" or (axis == "child" and flat)):
+            return nodes_out, True, flat and axis in ("self", "child")
+        return nodes_out, False, False
+
+    @staticmethod
+    def __filter(predicate: tuple, nodes: list, state: XPath.State) -> list:
+        size = len(nodes)
+        result = []
+
+        for position, node in enumerate(nodes, 1):
+            value = XPath.__eval(predicate, node, position, size, state)
+
+            if type(value) in (int, float):
+                if value == position: result.append(node)
+            elif XPath.__boolean(value):
+                result.append(node)
+
+        return result
+
+    @staticmethod
+    def __axis(axis: str, node: Any, walked: set|None) -> Iterator:
+        if axis == "child":
+            yield from XPath.__children(node)
+
+        elif axis == "descendant" or axis == "descendant-or-self":
+            if axis == "descendant-or-self":
+                if walked != None: walked.add(node)
+                yield node
+
+            stack = [iter(XPath.__children(node))]
+            while len(stack) != 0:
+                tag = next(stack[-1], None)
+                if tag == None:
+                    stack.pop()
+                    continue
+
+                if walked != None: walked.add(tag)
+                yield tag
+                stack.append(iter(XPath.__children(tag)))
+
+        elif axis == "self":
+            yield node
+
+        elif axis == "parent":
+            parent = XPath.__parent(node)
+            if parent != None: yield parent
+
+        elif axis == "ancestor" or axis == "ancestor-or-self":
+            if axis == "ancestor-or-self": yield node
+
+            parent = XPath.__parent(node)
+            while parent != None:
+                yield parent
+                parent = XPath.__parent(parent)
+
+        elif axis == "following-sibling" or axis == "preceding-sibling":
+            parent = XPath.__parent(node)
+            if parent == None: return
+
+            siblings = XPath.__children(parent)
+            for i, tag in enumerate(siblings):
+                if tag is node: break
+            else:
+                return
+
+            if axis == "following-sibling":
+                yield from siblings[i+1:]
+            else:
+                yield from siblings[i-1::-1] if i > 0 else ()
+
+        else:
+            raise Exception(f"Unsupported axis: {axis}")
+
+    @staticmethod
+    def __test(node: Any, test: str) -> bool:
+        if type(node) == XPath.Document or type(node) == str:
+            return test == "node()"
+
+        if test == "*": return node.tagname != None
+        if test == "node()": return True
+        if test == "text()": return type(node) == Text
+        if test == "comment()": return type(node) == Comment
+        return node.tagname == test
+
+    @staticmethod
+    def __children(node: Any) -> list:
+        if type(node) == XPath.Document: return [node.top]
+        if type(node) == str: return []
+        return node[:]
+
+    @staticmethod
+    def __parent(node: Any) -> Any:
+        if type(node) == XPath.Document or type(node) == str: return None
+        return node.parent
+
+    @staticmethod
+    def __document(node: Any) -> Any:
+        """Get the document node (topmost element or it's Root)"""
+        top = node
+        while XPath.__parent(top) != None:
+            top = XPath.__parent(top)
+
+        if type(top) == Root or type(top) == XPath.Document:
+            return top
+        return XPath.Document(top)
+
+    @staticmethod
+    def __attribute_values(node: Any, name: str) -> list[str]:
+        if type(node) == XPath.Document or type(node) == str:
+            return []
+
+        if name == "*":
+            names = list(node.attributes)
+            if len(node.classes) != 0 and "class" not in names: names.append("class")
+        else:
+            names = [name]
+
+        values = []
+        for name in names:
+            if name == "class" and len(node.classes) != 0:
+                values.append(" ".join(node.classes))
+                continue
+
+            value = node.get(name)
+            if value != None:
+                values.append("" if value == True and type(value) == bool else str(value))
+        return values
+
+    @staticmethod
+    def __string(value: Any) -> str:
+        if type(value) == str: return value
+        if type(value) == bool: return "true" if value else "false"
+        if type(value) in (int, float):
+            if math.isnan(value): return "NaN"
+            if math.isinf(value): return "Infinity" if value > 0 else "-Infinity"
+            return str(int(value)) if value == int(value) else str(value)
+        if type(value) == list:
+            return XPath.__string(value[0]) if len(value) != 0 else ""
+        if type(value) == XPath.Document:
+            return XPath.__string(value.top)
+        if type(value) == Text or type(value) == Comment:
+            return str(value.text)
+        return "".join(str(t.text) for t in value.iter_find(lambda t: type(t) == Text))
+
+    @staticmethod
+    def __number(value: Any) -> float:
+        if type(value) in (int, float): return float(value)
+        if type(value) == bool: return 1.0 if value else 0.0
+        try:
+            return float(XPath.__string(value).strip())
+        except ValueError:
+            return math.nan
+
+    @staticmethod
+    def __boolean(value: Any) -> bool:
+        if type(value) == list: return len(value) != 0
+        if type(value) in (int, float): return value != 0 and not math.isnan(value)
+        if type(value) == str: return len(value) != 0
+        return bool(value)
+
+    @staticmethod
+    def __compare(op: str, a: Any, b: Any) -> bool:
+        if type(a) == list and type(b) == list:
+            strings = [XPath.__string(n) for n in b]
+            return any(XPath.__compare(op, XPath.__string(n), strings) for n in a)
+        if type(a) == list:
+            if type(b) == bool: return XPath.__compare_values(op, XPath.__boolean(a), b)
+            return any(XPath.__compare_values(op, XPath.__string(n), b) for n in a)
+        if type(b) == list:
+            if type(a) == bool: return XPath.__compare_values(op, a, XPath.__boolean(b))
+            return any(XPath.__compare_values(op, a, XPath.__string(n)) for n in b)
+        return XPath.__compare_values(op, a, b)
+
+    @staticmethod
+    def __compare_values(op: str, a: Any, b: Any) -> bool:
+        if type(b) == list:
+            # string compared to strings of a node-set
+            return any(XPath.__compare_values(op, a, s) for s in b)
+
+        if op == "=" or op == "!=":
+            if type(a) == bool or type(b) == bool:
+                a, b = XPath.__boolean(a), XPath.__boolean(b)
+            elif type(a) in (int, float) or type(b) in (int, float):
+                a, b = XPath.__number(a), XPath.__number(b)
+            return (a == b) if op == "=" else (a != b)
+
+        a, b = XPath.__number(a), XPath.__number(b)
+        if op == "<": return a < b
+        if op == ">": return a > b
+        if op == "<=": return a <= b
+        return a >= b
+
+    @staticmethod
+    def __call(name: str, args: list[tuple], node: Any, position: int, size: int, state: XPath.State) -> Any:
+        values = [XPath.__eval(arg, node, position, size, state) for arg in args]
+
+        def string(i: int = 0) -> str:
+            return XPath.__string(values[i] if len(values) > i else [node])
+
+        match name:
+            case "last": return size
+            case "position": return position
+            case "count": return len(values[0])
+            case "true": return True
+            case "false": return False
+            case "not": return not XPath.__boolean(values[0])
+            case "boolean": return XPath.__boolean(values[0])
+            case "number": return XPath.__number(values[0] if len(values) != 0 else [node])
+            case "string": return string()
+            case "string-length": return len(string())
+            case "normalize-space": return " ".join(string().split())
+            case "concat": return "".join(XPath.__string(v) for v in values)
+            case "contains": return string(1) in string()
+            case "starts-with": return string().startswith(string(1))
+            case "ends-with": return string().endswith(string(1))
+            case "substring-before":
+                text, sep = string(), string(1)
+                return text[:text.find(sep)] if sep in text else ""
+            case "substring-after":
+                text, sep = string(), string(1)
+                return text[text.find(sep)+len(sep):] if sep in text else ""
+            case "lower-case": return string().lower()
+            case "upper-case": return string().upper()
+            case "name" | "local-name":
+                target = values[0] if len(values) != 0 else [node]
+                if len(target) == 0 or type(target[0]) == str or type(target[0]) == XPath.Document: return ""
+                return target[0].tagname or ""
+
+        raise Exception(f"Unknown XPath function: {name}()")
+
+    class Document:
+        """Document node used as the context of absolute paths"""
+        def __init__(self, top: Tag) -> None:
+            self.top = top
+
+    class State:
+        """Per-evaluation state (document order of elements)"""
+        def __init__(self) -> None:
+            self.__order: dict[Any, int] = None
+
+        def sort(self, nodes: list) -> list:
+            """Sort nodes in document order"""
+            tags = [n for n in nodes if type(n) != str]
+            if len(tags) < 2: return nodes
+
+            if self.__order == None or tags[0] not in self.__order:
+                self.__order = self.__number(tags[0])
+
+            order = self.__order
+            return sorted(nodes, key=lambda n: order.get(n, -1))
+
+        @staticmethod
+        def __number(node: Any) -> dict[Any, int]:
+            top = node
+            while type(top) != XPath.Document and top.parent != None:
+                top = top.parent
+
+            order: dict[Any, int] = {}
+            stack = [top]
+            while len(stack) != 0:
+                tag = stack.pop()
+                order[tag] = len(order)
+                stack.extend(reversed([tag.top]) if type(tag) == XPath.Document else tag[::-1])
+            return order
+
+    class Compiler:
+        """Recursive descent compiler for XPath expressions"""
+        def __init__(self, expression: str) -> None:
+            self.__expression = expression
+            self.__tokens = XPath.Compiler.__tokenize(expression)
+            self.__pos = 0
+
+        def compile(self) -> tuple:
+            """Compile expression into a syntax tree
+
+            Raises:
+                Exception: Invalid XPath expression
+
+            Returns:
+                tuple
+            """
+            expr = self.__parse_or()
+            if self.__peek() != None:
+                self.__error(f"unexpected {self.__peek()[1]!r}")
+            return expr
+
+        @staticmethod
+        def __tokenize(expression: str) -> list[tuple[str, str]]:
+            tokens = []
+            pos = 0
+            expression = expression.strip()
+
+            while pos < len(expression):
+                match = TOKEN_PATTERN.match(expression, pos)
+                if match == None or match.end() == pos:
+                    raise Exception(f"Invalid XPath expression: {expression!r} (at {pos})")
+
+                kind = match.lastgroup
+                tokens.append((kind, match.group(kind)))
+                pos = match.end()
+
+            return tokens
+
+        def __error(self, message: str):
+            raise Exception(f"Invalid XPath expression: {self.__expression!r} ({message})")
+
+        def __peek(self, offset: int = 0) -> tuple[str, str]|None:
+            pos = self.__pos + offset
+            return self.__tokens[pos] if pos < len(self.__tokens) else None
+
+        def __accept(self, *values: str) -> str|None:
+            token = self.__peek()
+            if token != None and token[0] in ("op", "name") and token[1] in values:
+                self.__pos += 1
+                return token[1]
+            return None
+
+        def __expect(self, value: str):
+            if self.__accept(value) == None:
+                self.__error(f"expected {value!r}")
+
+        def __parse_or(self) -> tuple:
+            expr = self.__parse_and()
+            while self.__accept("or"):
+                expr = ("op", "or", expr, self.__parse_and())
+            return expr
+
+        def __parse_and(self) -> tuple:
+            expr = self.__parse_equality()
+            while self.__accept("and"):
+                expr = ("op", "and", expr, self.__parse_equality())
+            return expr
+
+        def __parse_equality(self) -> tuple:
+            expr = self.__parse_relational()
+            while (op := self.__accept("=", "!=")) != None:
+                expr = ("op", op, expr, self.__parse_relational())
+            return expr
+
+        def __parse_relational(self) -> tuple:
+            expr = self.__parse_additive()
+            while (op := self.__accept("<", ">", "<=", ">=")) != None:
+                expr = ("op", op, expr, self.__parse_additive())
+            return expr
+
+        def __parse_additive(self) -> tuple:
+            expr = self.__parse_multiplicative()
+            while (op := self.__accept("+", "-")) != None:
+                expr = ("op", op, expr, self.__parse_multiplicative())
+            return expr
+
+        def __parse_multiplicative(self) -> tuple:
+            expr = self.__parse_unary()
+            while (op := self.__accept("*", "div", "mod")) != None:
+                expr = ("op", op, expr, self.__parse_unary())
+            return expr
+
+        def __parse_unary(self) -> tuple:
+            if self.__accept("-"):
+                return ("neg", self.__parse_unary())
+            return self.__parse_union()
+
+        def __parse_union(self) -> tuple:
+            expr = self.__parse_path()
+            if self.__peek() == ("op", "|"):
+                paths = [expr]
+                while self.__accept("|"):
+                    paths.append(self.__parse_path())
+                expr = ("union", paths)
+            return expr
+
+        def __parse_path(self) -> tuple:
+            token = self.__peek()
+            if token == None:
+                self.__error("unexpected end of expression")
+
+            kind, value = token
+
+            # Filter expression (primary expression with optional predicates and path)
+            if kind in ("string", "number") or value == "(" or \
+                (kind == "name" and self.__peek(1) == ("op", "(") and value not in NODE_TESTS):
+                primary = self.__parse_primary()
+                predicates = self.__parse_predicates()
+
+                if self.__peek() not in (("op", "/"), ("op", "//")):
+                    if len(predicates) == 0: return primary
+                    return ("path", ("filter", primary, predicates), [])
+
+                return ("path", ("filter", primary, predicates), self.__parse_steps())
+
+            # Location path
+            if value == "/" and kind == "op":
+                self.__pos += 1
+                if not self.__starts_step():
+                    return ("path", "/", [])
+                return ("path", "/", self.__parse_steps(first=True))
+
+            if value == "//" and kind == "op":
+                return ("path", "/", self.__parse_steps())
+
+            return ("path", None, self.__parse_steps(first=True))
+
+        def __starts_step(self) -> bool:
+            token = self.__peek()
+            return token != None and (token[0] == "name" or token[1] in (".", "..", "@", "*"))
+
+        def __parse_steps(self, first: bool = False) -> list[tuple]:
+            steps = []
+
+            if first:
+                steps.append(self.__parse_step())
+
+            while True:
+                if self.__accept("//"):
+                    steps.append(("descendant-or-self", "node()", [], False))
+                elif not self.__accept("/"):
+                    break
+                steps.append(self.__parse_step())
+
+            return XPath.Compiler.__optimize(steps)
+
+        def __parse_step(self) -> tuple:
+            if self.__accept("."):
+                return ("self", "node()", [], False)
+            if self.__accept(".."):
+                return ("parent", "node()", [], False)
+
+            axis = "child"
+            if self.__accept("@"):
+                axis = "attribute"
+            elif self.__peek(1) == ("op", "::"):
+                axis = self.__peek()[1]
+                if axis not in AXES:
+                    self.__error(f"unsupported axis {axis!r}")
+                self.__pos += 2
+
+            token = self.__peek()
+            if token == None:
+                self.__error("expected node test")
+
+            if token == ("op", "*"):
+                self.__pos += 1
+                test = "*"
+            elif token[0] == "name":
+                self.__pos += 1
+                test = token[1].lower()
+                if test in NODE_TESTS and self.__accept("("):
+                    self.__expect(")")
+                    test += "()"
+            else:
+                self.__error(f"expected node test, got {token[1]!r}")
+
+            predicates = self.__parse_predicates()
+            return (axis, test, predicates, any(XPath.Compiler.__is_positional(p) for p in predicates))
+
+        def __parse_predicates(self) -> list[tuple]:
+            predicates = []
+            while self.__accept("["):
+                predicates.append(self.__parse_or())
+                self.__expect("]")
+            return predicates
+
+        def __parse_primary(self) -> tuple:
+            kind, value = self.__peek()
+            self.__pos += 1
+
+            if kind == "string":
+                return ("str", value[1:-1])
+            if kind == "number":
+                return ("num", float(value))
+            if value == "(":
+                expr = self.__parse_or()
+                self.__expect(")")
+                return expr
+
+            # Function call
+            self.__expect("(")
+            args = []
+            if not self.__accept(")"):
+                args.append(self.__parse_or())
+                while self.__accept(","):
+                    args.append(self.__parse_or())
+                self.__expect(")")
+            return ("call", value, args)
+
+        @staticmethod
+        def __is_positional(expr: tuple) -> bool:
+            """Check if predicate result may depend on the context position"""
+            kind = expr[0]
+            if kind == "num" or kind == "neg": return True
+            if kind == "op" and expr[1] in ("+", "-", "*", "div", "mod"): return True
+            if kind == "call":
+                if expr[1] in ("position", "last", "count", "number", "string-length"): return True
+                return any(XPath.Compiler.__uses_position(arg) for arg in expr[2])
+            return XPath.Compiler.__uses_position(expr)
+
+        @staticmethod
+        def __uses_position(expr: tuple) -> bool:
+            kind = expr[0]
+            if kind == "call":
+                if expr[1] in ("position", "last"): return True
+                return any(XPath.Compiler.__uses_position(arg) for arg in expr[2])
+            if kind == "op":
+                return XPath.Compiler.__uses_position(expr[2]) or XPath.Compiler.__uses_position(expr[3])
+            if kind == "neg":
+                return XPath.Compiler.__uses_position(expr[1])
+            return False
+
+        @staticmethod
+        def __optimize(steps: list[tuple]) -> list[tuple]:
+            """Fuse `//name` (descendant-or-self::node()/child::name) into a single descendant step
+            when the predicates don't depend on the position"""
+            result = []
+            i = 0
+            while i < len(steps):
+                step = steps[i]
+                if step == ("descendant-or-self", "node()", [], False) and i+1 < len(steps):
+                    axis, test, predicates, positional = steps[i+1]
+                    if axis == "child" and not positional:
+                        result.append(("descendant", test, predicates, False))
+                        i += 2
+                        continue
+                result.append(step)
+                i += 1
+            return result
+
+AXES = (
+    "child", "descendant", "descendant-or-self", "self", "parent", "ancestor",
+    "ancestor-or-self", "following-sibling", "preceding-sibling", "attribute")
+DESCENDANT_AXES = ("descendant", "descendant-or-self")
+REVERSE_AXES = ("ancestor", "ancestor-or-self", "preceding-sibling")
+FLAT_AXES = ("child", "self", "parent", "following-sibling", "preceding-sibling")
+COMPARISONS = ("=", "!=", "<", ">", "<=", ">=")
+NODE_TESTS = ("node", "text", "comment")
+
+TOKEN_PATTERN = re.compile(r"""\s*(?:
+    (?P<string>"[^"]*"|'[^']*')
+    |(?P<number>\d+(?:\.\d*)?|\.\d+)
+    |(?P<op>//|::|\.\.|!=|<=|>=|[/\[\]()@,|.*=<>+-])
+    |(?P<name>[A-Za-z_][\w-]*)
+)\s*""", re.VERBOSE)
@@ -1,5 +1,14 @@
 from luxon.http.app import App
 from luxon.http.route import Route
+from luxon.http.router import Router
+from luxon.http.converter import Converter
 from luxon.http.request import Request
 from luxon.http.response import Response
-from luxon.http.server import HttpServer
\ No newline at end of file
+from luxon.http.server import HttpServer, AsyncHttpServer
+from luxon.http.static import StaticFiles
+from luxon.http.compression import Compression
+from luxon.http.body import RequestBody
+from luxon.http.formdata import FormData, UploadedFile
+from luxon.http.cache import ResponseCache
+from luxon.http.middleware import Middleware
+from luxon.http.mounts import Mounts
\ No newline at end of file
@@ -1,95 +1,376 @@
 from __future__ import annotations
 from typing import Any, Callable
-from luxon.http.server import HttpServer
+import re
+import asyncio
+import inspect
+import functools
+import weakref
+from concurrent.futures import Future
+from luxon.http.server import HttpServer, AsyncHttpServer
 from luxon.http.request import Request
 from luxon.http.response import Response
 from luxon.http.route import Route
+from luxon.http.router import Router
+from luxon.http.static import StaticFiles
+from luxon.http.compression import Compression
+from luxon.http.cache import ResponseCache
+from luxon.http.middleware import Middleware
+from luxon.http.mounts import Mounts
 from luxon.html.tag import Tag
 
 class App:
-    """Luxon application"""
-    def __init__(self, path: str = "/") -> None:
-        """Create new Luxon application"""
+    """Luxon application\n
+    Several apps can share one server by passing the same `server` with different paths.
+    """
+    __servers: weakref.WeakKeyDictionary[HttpServer|AsyncHttpServer, Mounts] = weakref.WeakKeyDictionary()
+
+    def __init__(self, path: str = "/", server: HttpServer|AsyncHttpServer = None, compression: Compression = None) -> None:
+        """Create new Luxon application
+
+        Args:
+            path (str, optional): App path. Defaults to `"/"`.
+            server (HttpServer|AsyncHttpServer, optional): HTTP server, shared with other apps mounted on it. Defaults to None (new HttpServer).
+            compression (Compression, optional): Response compression settings. Defaults to None (no compression).
+
+        Raises:
+            ValueError: Another app is mounted on the same path of the server
+        """
         super().__init__()
 
         self.__path = path
-        self.__routes: list[Route] = []
+        self.__prefix = path.rstrip("/")
+        self.__router = Router()
+        self.__compression = compression
+        self.__cache = ResponseCache()
+        self.__middleware: list[Middleware] = []
+        self.__chains: dict[Route, Callable[[Request, Response], Any]] = {}
+        self.__compiled = False
+
+        self.__server = server if server != None else HttpServer()
 
-        self.__server = HttpServer()
-        self.__server.on_request += self.__request_handler
+        asynchronous = isinstance(self.__server, AsyncHttpServer)
+        mounts = App.__servers.get(self.__server)
+        if mounts == None:
+            mounts = App.__servers[self.__server] = Mounts(self.__server, asynchronous)
+
+        mounts.add(path, self, self.__async_request_handler if asynchronous else self.__request_handler)
+        self.__mounts = mounts
 
     @property
     def path(self) -> str:
         """App path"""
         return self.__path
 
-    def route(self, method: str = "GET", path: str = "/", pattern: str = None):
-        """Add handler to new route
+    @property
+    def router(self) -> Router:
+        """Route table"""
+        return self.__router
+
+    @property
+    def mounts(self) -> Mounts:
+        """Apps sharing the server"""
+        return self.__mounts
+
+    @property
+    def cache(self) -> ResponseCache:
+        """Response cache of routes with `cache` set"""
+        return self.__cache
+
+    @property
+    def server(self) -> HttpServer|AsyncHttpServer:
+        """HTTP server"""
+        return self.__server
+
+    def route(self, method: str = "GET", path: str = "/", pattern: str = None, cache: float = None, vary: tuple[str, ...] = ()):
+        """Add handler to new route\n
+        Handlers can be plain functions or coroutine functions (`async def`).
 
         Args:
             method (str, optional): HTTP method. Defaults to `"GET"`.
-            path (str, optional): HTTP path. Defaults to `"/"`.
+            path (str, optional): HTTP path. Segments like `<name>` or `<int:name>` (converters: `str`, `int`, `uuid`, `slug`, `path`) 
+                are set in `request.params` and passed to handlers that take them as keyword arguments. Defaults to `"/"`.
             pattern (str, optional): Regular expression pattern. Defaults to None.
+            cache (float, optional): Cache the rendered response for this many seconds. 
+                Only responses returned from the handler with status 200 are cached. Defaults to None (not cached).
+            vary (tuple[str, ...], optional): Request headers that are part of the cache key. Defaults to ().
+        """
+        def decorator(func: Callable[[Request, Response], Any]) -> Callable[[Request, Response], Any]:
+            self.__router.add(Route(handler=func, method=method, path=path, pattern=pattern, cache=cache, vary=vary))
+            self.__compiled = False
+            return func
+
+        return decorator
+
+    def use(self, middleware: Middleware):
+        """Add middleware, hooks run in registration order (the first one is the outermost)\n
+        Hooks are compiled into one call chain per route, routes without hooks call the handler directly.
+
+        Args:
+            middleware (Middleware): Middleware
+        """
+        self.__middleware.append(middleware)
+        self.__compiled = False
+
+    def before(self, path: str = "/"):
+        """Add hook that runs before route handlers, returning a value short-circuits the handler (see `Middleware`)
+
+        Args:
+            path (str, optional): Only routes under this path prefix run the hook. Defaults to `"/"`.
         """
         def decorator(func: Callable[[Request, Response], Any]) -> Callable[[Request, Response], Any]:
-            self.__routes.append(Route(handler=func, method=method, path=path, pattern=pattern))
+            self.use(Middleware("before", func, path))
+            return func
+
+        return decorator
+
+    def after(self, path: str = "/"):
+        """Add hook that runs after route handlers and returns the value to write (see `Middleware`)
+
+        Args:
+            path (str, optional): Only routes under this path prefix run the hook. Defaults to `"/"`.
+        """
+        def decorator(func: Callable[[Request, Response, Any], Any]) -> Callable[[Request, Response, Any], Any]:
+            self.use(Middleware("after", func, path))
             return func
-            
+
         return decorator
 
-    def start(self, server_address: tuple[str, int]):
-        """Start Luxon application
+    def around(self, path: str = "/"):
+        """Add hook that wraps route handlers and calls `call_next()` to run them (see `Middleware`)
+
+        Args:
+            path (str, optional): Only routes under this path prefix run the hook. Defaults to `"/"`.
+        """
+        def decorator(func: Callable[[Request, Response, Callable], Any]) -> Callable[[Request, Response, Callable], Any]:
+            self.use(Middleware("around", func, path))
+            return func
+
+        return decorator
+
+    def static(self, path: str, directory: str, cache_size: int = 32 * 1024 * 1024, max_file_size: int = 1024 * 1024) -> StaticFiles:
+        """Serve static files from a directory (see `StaticFiles`)
+
+        Args:
+            path (str): HTTP path prefix (e.g. `"/assets"`)
+            directory (str): Directory to serve files from
+            cache_size (int, optional): Max memory cache size in bytes. Defaults to 32 MiB.
+            max_file_size (int, optional): Max size of a cached file in bytes. Defaults to 1 MiB.
+
+        Returns:
+            StaticFiles: Static file handler
+        """
+        handler = StaticFiles(directory, cache_size=cache_size, max_file_size=max_file_size)
+        pattern = f"^{re.escape(path.rstrip('/'))}/(.*)$"
+
+        for method in ("GET", "HEAD"):
+            self.__router.add(Route(handler=handler, method=method, pattern=pattern))
+        self.__compiled = False
+
+        return handler
+
+    def start(self, server_address: tuple[str, int], workers: int = 1):
+        """Start Luxon application (and the other apps mounted on the server)
 
         Args:
             server_address (tuple[str, int]): Address and port to listen on
+            workers (int, optional): Number of worker processes. Defaults to 1.
         """
+        for app in self.__mounts.apps:
+            app.compile()
+
         self.__server.bind(server_address)
-        self.__server.start()
+        self.__server.start(workers=workers)
 
     def __get_bytes(self, data: str|bytes|Tag) -> bytes|None:
         if issubclass(type(data), Tag):
             return data.html().encode(encoding="utf-8")
         elif type(data) == str:
             return data.encode(encoding="utf-8")
+        elif type(data) == bytes:
+            return data
         return None
 
-    def __request_handler(self, request: Request, response: Response):
-        path = request.path.split("?")[0] # path without query string
-        found = False
+    def __match(self, request: Request) -> Route|None:
+        """Find the first route matching the request (sets request groups and params)"""
+        path = request.path
+
+        # app path, the prefix is matched by the mounts trie
+        if self.__prefix != "":
+            path = path[len(self.__prefix):] or "/"
+
+        match = self.__router.match(request.method, path)
+        if match == None:
+            return None
+
+        route, request.groups, request.params = match
+        return route
+
+    def __not_found(self, response: Response):
+        response.status.code = 404
+        response.status.message = "Route Not Found"
+        response.write_all(self.__get_bytes("Route Not Found"))
 
-        if path.startswith(self.path):
-            # app path
-            if self.path != "/":
-                path = path[len(self.path):]
-                if path == "": path = "/"
+    def compile(self):
+        """Compile route table and middleware chains of routes that have hooks (done by `start`)"""
+        self.__router.compile()
+        asynchronous = isinstance(self.__server, AsyncHttpServer)
+        chains: dict[Route, Callable[[Request, Response], Any]] = {}
 
-            for route in self.__routes:
-                # check request method
-                if request.method != route.method:
-                    continue
+        for route in self.__router.routes:
+            hooks = [hook for hook in self.__middleware if hook.applies(route)]
+            if len(hooks) == 0:
+                continue
 
-                if route.pattern != None:
-                    # check pattern
-                    match = route.pattern.search(path)
+            handle = functools.partial(self.__handle_async if asynchronous else self.__handle, route)
+            chains[route] = Middleware.chain(hooks, handle, asynchronous)
 
-                    if match != None:
-                        found = True
-                        request.groups = match.groups()
-                        value = route.handler(request, response)
+        self.__chains = chains
+        self.__compiled = True
 
-                        if value != None: 
-                            response.write_all(self.__get_bytes(value))
+    def __request_handler(self, request: Request, response: Response):
+        response.compression = self.__compression
+        route = self.__match(request)
+
+        # route not found
+        if route == None:
+            self.__not_found(response)
+            return
 
-                # check path
-                elif path == route.path:
-                    found = True
-                    value = route.handler(request, response)
+        if not self.__compiled:
+            self.compile()
 
-                    if value != None: 
-                        response.write_all(self.__get_bytes(value))
+        chain = self.__chains.get(route)
+        self.__write(response, chain(request, response) if chain != None else self.__handle(route, request, response))
+
+    async def __async_request_handler(self, request: Request, response: Response):
+        response.compression = self.__compression
+        route = self.__match(request)
 
         # route not found
-        if not found:
-            response.status.code = 404
-            response.status.message = "Route Not Found"
-            response.write_all("Route Not Found")
\ No newline at end of file
+        if route == None:
+            self.__not_found(response)
+            return
+
+        if not self.__compiled:
+            self.compile()
+
+        chain = self.__chains.get(route)
+        self.__write(response, await (chain(request, response) if chain != None else self.__handle_async(route, request, response)))
+
+    def __handle(self, route: Route, request: Request, response: Response) -> Any:
+        """Get route response from the cache or the handler"""
+        if route.cache == None or request.method not in ("GET", "HEAD"):
+            return self.__invoke(route, request, response)
+
+        key = ResponseCache.key(request, route.vary)
+        entry = self.__cache.get(key)
+        App.__vary(response, route.vary)
+
+        if entry == None or entry.expired:
+            flight, leader = self.__cache.begin(key)
+
+            if leader:
+                body = None
+                headers = dict(response.headers)
+                try:
+                    body = self.__get_bytes(self.__invoke(route, request, response))
+                finally:
+                    self.__end_flight(key, flight, route, response, body, headers)
+                return body
+
+            if entry == None:
+                # wait for the request that regenerates the response
+                entry = flight.result()
+                if entry == None:
+                    return self.__invoke(route, request, response)
+
+        body = entry.apply(response)
+        App.__vary(response, route.vary)
+        return body
+
+    async def __handle_async(self, route: Route, request: Request, response: Response) -> Any:
+        """Get route response from the cache or the handler without blocking the event loop"""
+        if route.cache == None or request.method not in ("GET", "HEAD"):
+            return await self.__invoke_async(route, request, response)
+
+        key = ResponseCache.key(request, route.vary)
+        entry = self.__cache.get(key)
+        App.__vary(response, route.vary)
+
+        if entry == None or entry.expired:
+            flight, leader = self.__cache.begin(key)
+
+            if leader:
+                body = None
+                headers = dict(response.headers)
+                try:
+                    body = self.__get_bytes(await self.__invoke_async(route, request, response))
+                finally:
+                    self.__end_flight(key, flight, route, response, body, headers)
+                return body
+
+            if entry == None:
+                # wait for the request that regenerates the response
+                entry = await asyncio.wrap_future(flight)
+                if entry == None:
+                    return await self.__invoke_async(route, request, response)
+
+        body = entry.apply(response)
+        App.__vary(response, route.vary)
+        return body
+
+    def __invoke(self, route: Route, request: Request, response: Response) -> Any:
+        """Call route handler on a threaded server"""
+        value = route.handler(request, response, **request.params) if route.bind_params else route.handler(request, response)
+
+        if inspect.isawaitable(value):
+            # coroutine handler on a threaded server
+            value = asyncio.run(App.__await(value))
+        return value
+
+    async def __invoke_async(self, route: Route, request: Request, response: Response) -> Any:
+        """Call route handler on an asyncio server"""
+        kwargs = request.params if route.bind_params else {}
+
+        if asyncio.iscoroutinefunction(route.handler):
+            value = await route.handler(request, response, **kwargs)
+        else:
+            # plain handlers may block so they run in the executor
+            value = await asyncio.get_running_loop().run_in_executor(None, functools.partial(route.handler, request, response, **kwargs))
+
+        if inspect.isawaitable(value):
+            value = await value
+        return value
+
+    def __write(self, response: Response, value: Any):
+        if value != None:
+            response.write_all(self.__get_bytes(value))
+
+    def __end_flight(self, key: tuple, flight: Future, route: Route, response: Response, body: bytes|None, before: dict[str, str|int]):
+        """Store regenerated response if it's cacheable and wake up waiting requests
+
+        Args:
+            before (dict[str, str|int]): Response headers before the handler was called, only headers set by the handler are cached
+        """
+        entry = None
+        if body != None and not response.headers_sent and ResponseCache.cacheable(response):
+            headers = {name: value for name, value in response.headers.items() if before.get(name) != value}
+            entry = ResponseCache.Entry(response, body, route.cache, headers)
+        self.__cache.end(key, flight, entry)
+
+    @staticmethod
+    def __vary(response: Response, vary: tuple[str, ...]):
+        """Add request headers that are part of the cache key to the `Vary` header"""
+        if len(vary) == 0:
+            return
+
+        current = response.get_header("Vary")
+        listed = [name.strip().lower() for name in str(current).split(",")] if current != None else []
+        names = [name for name in vary if name.lower() not in listed]
+
+        if len(names) != 0:
+            response.headers["Vary"] = ", ".join(([str(current)] if current != None else []) + names)
+
+    @staticmethod
+    async def __await(value: Any) -> Any:
+        return await value
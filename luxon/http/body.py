@@ -0,0 +1,231 @@
+from __future__ import annotations
+from typing import AsyncIterator, Iterator
+import re
+from luxon.consts import *
+from luxon.http.headers import Headers
+
+class RequestBody:
+    """Request body stream (`Content-Length` or `Transfer-Encoding: chunked`)\n
+    The body is read from the connection on demand, so handlers can stream large
+    uploads without holding them in memory. Bytes after the body stay in the
+    connection buffer for the next request.
+    """
+    def __init__(self, connection, headers: Headers, max_size: int = None) -> None:
+        """Create new RequestBody
+
+        Args:
+            connection (Connection|AsyncSocket): Buffered client connection
+            headers (Headers): Request headers
+            max_size (int, optional): Max body size in bytes. Defaults to None (no limit).
+
+        Raises:
+            RequestBody.Invalid: Invalid `Content-Length` or `Transfer-Encoding`
+            RequestBody.TooLarge: `Content-Length` is larger than `max_size`
+        """
+        self.__connection = connection
+        self.__max_size = max_size
+        self.__length: int|None = None
+        self.__chunked = False
+        self.__remaining = 0
+        self.__received = 0
+        self.__crlf = False
+        self.__trailers = False
+        self.__done = False
+
+        transfer_encoding = headers.get("Transfer-Encoding")
+        content_length = headers.get("Content-Length")
+
+        if transfer_encoding != None:
+            codings = [c.strip().lower() for c in transfer_encoding.split(",")]
+            if codings[-1] != "chunked" or content_length != None:
+                raise RequestBody.Invalid("Unsupported Transfer-Encoding")
+            self.__chunked = True
+
+        elif content_length != None:
+            if not content_length.strip().isdigit():
+                raise RequestBody.Invalid("Invalid Content-Length")
+
+            self.__length = self.__remaining = int(content_length)
+            if max_size != None and self.__length > max_size:
+                raise RequestBody.TooLarge()
+
+        self.__done = not self.__chunked and self.__remaining == 0
+
+    @property
+    def length(self) -> int|None:
+        """Body length from `Content-Length` or None if the body is chunked"""
+        return self.__length
+
+    @property
+    def chunked(self) -> bool:
+        """True if the body uses chunked transfer coding"""
+        return self.__chunked
+
+    @property
+    def received(self) -> int:
+        """Number of body bytes read so far"""
+        return self.__received
+
+    @property
+    def done(self) -> bool:
+        """True if the whole body has been read"""
+        return self.__done
+
+    def read(self, length: int = -1) -> bytes:
+        """Read body data (blocks until data is available)
+
+        Args:
+            length (int, optional): Max number of bytes to read. Defaults to -1 (rest of the body).
+
+        Raises:
+            RequestBody.Invalid: Malformed chunked body
+            RequestBody.TooLarge: Body is larger than `max_size`
+
+        Returns:
+            bytes: Data or empty bytes at the end of the body
+        """
+        if length < 0:
+            return b"".join(iter(self))
+
+        while True:
+            data = self.__take(length)
+            if data != None:
+                return data
+            if not self.__connection.fill():
+                raise ConnectionError("Connection closed before the request body was received")
+
+    async def read_async(self, length: int = -1) -> bytes:
+        """Read body data without blocking the event loop
+
+        Args:
+            length (int, optional): Max number of bytes to read. Defaults to -1 (rest of the body).
+
+        Raises:
+            RequestBody.Invalid: Malformed chunked body
+            RequestBody.TooLarge: Body is larger than `max_size`
+
+        Returns:
+            bytes: Data or empty bytes at the end of the body
+        """
+        if length < 0:
+            return b"".join([chunk async for chunk in self])
+
+        while True:
+            data = self.__take(length)
+            if data != None:
+                return data
+            if not await self.__connection.fill_async():
+                raise ConnectionError("Connection closed before the request body was received")
+
+    def readinto(self, buffer: bytearray|memoryview) -> int:
+        """Read body data into a buffer
+
+        Args:
+            buffer (bytearray|memoryview): Writable buffer
+
+        Returns:
+            int: Number of bytes read, 0 at the end of the body
+        """
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def discard(self):
+        """Skip the unread part of the body"""
+        while len(self.read(FILE_BUFFER_SIZE)) != 0:
+            pass
+
+    async def discard_async(self):
+        """Skip the unread part of the body without blocking the event loop"""
+        while len(await self.read_async(FILE_BUFFER_SIZE)) != 0:
+            pass
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Iterate over body data in chunks of up to FILE_BUFFER_SIZE bytes"""
+        while True:
+            data = self.read(FILE_BUFFER_SIZE)
+            if len(data) == 0: break
+            yield data
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Iterate over body data without blocking the event loop"""
+        while True:
+            data = await self.read_async(FILE_BUFFER_SIZE)
+            if len(data) == 0: break
+            yield data
+
+    def __take(self, length: int) -> bytes|None:
+        """Take body data from the connection buffer
+
+        Returns:
+            bytes|None: Data, empty bytes at the end of the body or None if more input is needed
+        """
+        buffer: bytearray = self.__connection.buffer
+
+        while not self.__done:
+            if self.__remaining > 0:
+                if len(buffer) == 0:
+                    return None
+
+                size = min(length, self.__remaining, len(buffer))
+                data = bytes(buffer[:size])
+                del buffer[:size]
+
+                self.__remaining -= size
+                self.__received += size
+                if self.__max_size != None and self.__received > self.__max_size:
+                    raise RequestBody.TooLarge()
+                if not self.__chunked and self.__remaining == 0:
+                    self.__done = True
+                return data
+
+            # CRLF after chunk data
+            if self.__crlf:
+                if len(buffer) < 2:
+                    return None
+                if buffer[:2] != b"\r\n":
+                    raise RequestBody.Invalid("Invalid chunk")
+                del buffer[:2]
+                self.__crlf = False
+
+            # chunk size line or trailer field
+            end = buffer.find(b"\r\n")
+            if end == -1:
+                if len(buffer) > BUFFER_SIZE:
+                    raise RequestBody.Invalid("Chunk header too long")
+                return None
+
+            line = bytes(buffer[:end])
+            del buffer[:end + 2]
+
+            if self.__trailers:
+                # trailer fields end with an empty line
+                if len(line) == 0: self.__done = True
+                continue
+
+            size, extension, _ = line.partition(b";")
+            if extension != b"":
+                # whitespace is only allowed before chunk extensions
+                size = size.rstrip(b" \t")
+            if CHUNK_SIZE_PATTERN.fullmatch(size) == None:
+                raise RequestBody.Invalid("Invalid chunk size")
+
+            size = int(size, 16)
+            if size == 0:
+                self.__trailers = True
+                continue
+
+            self.__remaining = size
+            self.__crlf = True
+
+        return b""
+
+    class TooLarge(Exception):
+        """Request body is larger than the allowed max size"""
+        pass
+
+    class Invalid(ValueError):
+        """Malformed request body framing (`Content-Length`, `Transfer-Encoding` or chunks)"""
+        pass
+
+CHUNK_SIZE_PATTERN = re.compile(rb"[0-9A-Fa-f]+")
@@ -0,0 +1,174 @@
+from __future__ import annotations
+from collections import OrderedDict
+from concurrent.futures import Future
+import time
+import threading
+from luxon.http.request import Request
+from luxon.http.response import Response
+
+class ResponseCache:
+    """LRU cache of rendered responses used by `App.route(..., cache=ttl)`\n
+    Entries are keyed on method, path, query string and selected request headers.
+    Only one request regenerates a missing or expired entry at a time: other requests
+    for the same key serve the stale entry if there is one or wait for the result.
+    """
+    def __init__(self, max_entries: int = 1024) -> None:
+        """Create new ResponseCache
+
+        Args:
+            max_entries (int, optional): Max number of cached responses. Defaults to 1024.
+        """
+        self.__max_entries = max_entries
+        self.__entries: OrderedDict[tuple, ResponseCache.Entry] = OrderedDict()
+        self.__flights: dict[tuple, Future] = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @staticmethod
+    def key(request: Request, vary: tuple[str, ...] = ()) -> tuple:
+        """Cache key of a request
+
+        Args:
+            request (Request): Request
+            vary (tuple[str, ...], optional): Request headers the response depends on. Defaults to ().
+
+        Returns:
+            tuple
+        """
+        query = tuple(sorted(request.query.items()))
+        return (request.method, request.path, query) + tuple(request.get_header(name) for name in vary)
+
+    def get(self, key: tuple) -> ResponseCache.Entry|None:
+        """Get cached response (fresh or expired)
+
+        Args:
+            key (tuple): Cache key
+
+        Returns:
+            ResponseCache.Entry|None
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry != None:
+                self.__entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, entry: ResponseCache.Entry):
+        """Store response, least recently used entries are evicted
+
+        Args:
+            key (tuple): Cache key
+            entry (ResponseCache.Entry): Response
+        """
+        with self.__lock:
+            self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self.__lock:
+            self.__entries.clear()
+
+    def begin(self, key: tuple) -> tuple[Future, bool]:
+        """Start regenerating an entry
+
+        Args:
+            key (tuple): Cache key
+
+        Returns:
+            tuple[Future, bool]: Future resolving to the new entry (or None if the response
+                wasn't cacheable) and True if the caller should regenerate the entry
+        """
+        with self.__lock:
+            flight = self.__flights.get(key)
+            if flight != None:
+                return flight, False
+
+            flight = self.__flights[key] = Future()
+            return flight, True
+
+    def end(self, key: tuple, flight: Future, entry: ResponseCache.Entry|None):
+        """Finish regenerating an entry and wake up waiting requests
+
+        Args:
+            key (tuple): Cache key
+            flight (Future): Future returned by `begin`
+            entry (ResponseCache.Entry|None): New entry or None if the response wasn't cacheable
+        """
+        if entry != None:
+            self.put(key, entry)
+
+        with self.__lock:
+            self.__flights.pop(key, None)
+        flight.set_result(entry)
+
+    @staticmethod
+    def cacheable(response: Response) -> bool:
+        """Check if a response can be shared between clients (status 200, 
+        no `Set-Cookie` and no `Cache-Control: private` or `no-store`)
+
+        Args:
+            response (Response): Response
+
+        Returns:
+            bool
+        """
+        if response.status.code != 200:
+            return False
+
+        # response header names are case-sensitive dict keys
+        for name, value in response.headers.items():
+            name = name.lower()
+            if name == "set-cookie":
+                return False
+            if name == "cache-control":
+                directives = [directive.partition("=")[0].strip().lower() for directive in str(value).split(",")]
+                if "private" in directives or "no-store" in directives:
+                    return False
+
+        return True
+
+    class Entry:
+        """Cached response"""
+        def __init__(self, response: Response, body: bytes, ttl: float, headers: dict[str, str|int]) -> None:
+            """Create new Entry
+
+            Args:
+                response (Response): Response the handler produced
+                body (bytes): Response body
+                ttl (float): Seconds the entry is fresh for
+                headers (dict[str, str|int]): Headers set by the handler
+            """
+            self.code: int = response.status.code
+            self.message: str = response.status.message
+            self.headers: dict[str, str|int] = {
+                name: value for name, value in headers.items()
+                if name not in ("Connection", "Content-Length")}
+            self.body: bytes = body
+            self.expires: float = time.monotonic() + ttl
+
+        @property
+        def expired(self) -> bool:
+            return time.monotonic() >= self.expires
+
+        def apply(self, response: Response) -> bytes:
+            """Set cached status and headers, headers already set for this request 
+            (e.g. by middleware hooks) are kept
+
+            Returns:
+                bytes: Cached body
+            """
+            response.status.code = self.code
+            response.status.message = self.message
+
+            for name, value in self.headers.items():
+                current = response.get_header(name)
+                if current == None or current == Response.DEFAULT_HEADERS.get(name):
+                    response.headers[name] = value
+
+            return self.body
@@ -0,0 +1,174 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import gzip
+import zlib
+from luxon.http.headers import AcceptEncodingHeader
+
+if TYPE_CHECKING:
+    from luxon.http.request import Request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class Compression:
+    """Response compression settings and content coding helpers\n
+    gzip and deflate are always available, brotli and zstd when the
+    `brotli` and `zstandard` packages are installed.
+    """
+    def __init__(self, min_size: int = 1024, level: int = 6, encodings: tuple[str, ...] = None) -> None:
+        """Create new response compression settings
+
+        Args:
+            min_size (int, optional): Responses smaller than this (in bytes) are not compressed. Defaults to 1024.
+            level (int, optional): Compression level (1-9). Defaults to 6.
+            encodings (tuple[str, ...], optional): Allowed content codings in preference order. Defaults to None (all supported).
+        """
+        self.__min_size = min_size
+        self.__level = level
+        self.__encodings = tuple(e for e in (encodings or Compression.encodings()) if e in Compression.encodings())
+
+    @property
+    def min_size(self) -> int:
+        """Min response size in bytes"""
+        return self.__min_size
+
+    @property
+    def level(self) -> int:
+        """Compression level"""
+        return self.__level
+
+    def negotiate(self, request: Request, content_type: str|None) -> str|None:
+        """Select content coding for a response
+
+        Args:
+            request (Request): Request
+            content_type (str|None): Response content type
+
+        Returns:
+            str|None: Content coding or None if the response should not be compressed
+        """
+        if not Compression.compressible(content_type):
+            return None
+
+        accept_encoding = request.get_header("Accept-Encoding")
+        if accept_encoding == None:
+            return None
+
+        encoding = AcceptEncodingHeader.parse(accept_encoding).select(*self.__encodings, "identity")
+        return encoding if encoding != "identity" else None
+
+    @staticmethod
+    def encodings() -> tuple[str, ...]:
+        """Supported content codings in preference order
+
+        Returns:
+            tuple[str, ...]
+        """
+        encodings = ("gzip", "deflate")
+        if zstandard != None: encodings = ("zstd",) + encodings
+        if brotli != None: encodings = ("br",) + encodings
+        return encodings
+
+    @staticmethod
+    def compressible(content_type: str|None) -> bool:
+        """Check if content type is worth compressing (text-based and not already compressed)
+
+        Args:
+            content_type (str|None): Content type with optional parameters
+
+        Returns:
+            bool
+        """
+        if content_type == None: return False
+
+        mime = str(content_type).split(";")[0].strip().lower()
+        return mime.startswith("text/") or mime in COMPRESSIBLE_TYPES or mime.endswith(("+xml", "+json"))
+
+    @staticmethod
+    def compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+        """Compress data using content coding
+
+        Args:
+            data (bytes): Data
+            encoding (str): Content coding (`"gzip"`, `"deflate"`, `"br"` or `"zstd"`)
+            level (int, optional): Compression level (1-9). Defaults to 6.
+
+        Raises:
+            Exception: Unsupported content coding
+
+        Returns:
+            bytes: Compressed data
+        """
+        if encoding == "gzip":
+            return gzip.compress(data, compresslevel=level, mtime=0)
+        if encoding == "deflate":
+            return zlib.compress(data, level)
+        if encoding == "br" and brotli != None:
+            return brotli.compress(data, quality=min(level + 2, 11))
+        if encoding == "zstd" and zstandard != None:
+            return zstandard.ZstdCompressor(level=level).compress(data)
+
+        raise Exception(f"Unsupported content coding: {encoding}")
+
+    class Stream:
+        """Incremental compressor for streamed responses"""
+        def __init__(self, encoding: str, level: int = 6) -> None:
+            """Create new incremental compressor
+
+            Args:
+                encoding (str): Content coding
+                level (int, optional): Compression level (1-9). Defaults to 6.
+
+            Raises:
+                Exception: Unsupported content coding
+            """
+            self.__encoding = encoding
+
+            if encoding == "gzip":
+                self.__compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+            elif encoding == "deflate":
+                self.__compressor = zlib.compressobj(level)
+            elif encoding == "br" and brotli != None:
+                self.__compressor = brotli.Compressor(quality=min(level + 2, 11))
+            elif encoding == "zstd" and zstandard != None:
+                self.__compressor = zstandard.ZstdCompressor(level=level).compressobj()
+            else:
+                raise Exception(f"Unsupported content coding: {encoding}")
+
+        def compress(self, data: bytes) -> bytes:
+            """Compress data and flush it so the client can decode everything written so far
+
+            Args:
+                data (bytes): Data
+
+            Returns:
+                bytes: Compressed data
+            """
+            if self.__encoding == "br":
+                return self.__compressor.process(data) + self.__compressor.flush()
+            if self.__encoding == "zstd":
+                return self.__compressor.compress(data) + self.__compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+            return self.__compressor.compress(data) + self.__compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        def finish(self) -> bytes:
+            """End compressed stream
+
+            Returns:
+                bytes: Remaining compressed data
+            """
+            if self.__encoding == "br":
+                return self.__compressor.finish()
+            return self.__compressor.flush()
+
+COMPRESSIBLE_TYPES = (
+    "application/javascript", "application/json", "application/xml", "application/xhtml+xml",
+    "application/rss+xml", "application/atom+xml", "application/wasm", "application/x-javascript",
+    "application/manifest+json", "image/svg+xml", "image/x-icon", "image/vnd.microsoft.icon",
+    "font/ttf", "font/otf", "application/vnd.ms-fontobject")
@@ -0,0 +1,167 @@
+from __future__ import annotations
+import time
+import socket
+import asyncio
+from luxon.consts import *
+
+class Connection:
+    """Buffered client connection used by HttpServer\n
+    Bytes received past the end of a request head stay in the buffer, so request
+    bodies and pipelined requests are read in order.
+    """
+    def __init__(self, sock: socket.socket, address: tuple[str, int]) -> None:
+        """Create new Connection
+
+        Args:
+            sock (socket.socket): Client socket
+            address (tuple[str, int]): Client address
+        """
+        self.__sock = sock
+        self.__address = address
+        self.__buffer = bytearray()
+        self.__requests = 0
+
+    @property
+    def socket(self) -> socket.socket:
+        """Client socket"""
+        return self.__sock
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Client address"""
+        return self.__address
+
+    @property
+    def requests(self) -> int:
+        """Number of requests read from this connection"""
+        return self.__requests
+
+    def read_head(self, max_size: int, idle_timeout: float = None, header_timeout: float = None) -> bytes|None:
+        """Read request line and headers
+
+        Args:
+            max_size (int): Max size of the request head in bytes
+            idle_timeout (float, optional): Max time to wait for the first byte of the request. Defaults to None (no timeout).
+            header_timeout (float, optional): Max time to receive the whole head after the first byte. Defaults to None (no timeout).
+
+        Raises:
+            Connection.HeadTooLarge: Request head is larger than `max_size`
+            TimeoutError: Connection was idle or the head was not received in time
+
+        Returns:
+            bytes|None: Request head (including the empty line) or None if the client closed the connection
+        """
+        deadline = None
+        scanned = 0
+
+        while True:
+            head = Connection.take_head(self.__buffer, max_size, scanned)
+            if head != None:
+                self.__requests += 1
+                return head
+
+            scanned = max(len(self.__buffer) - 3, 0)
+
+            if len(self.__buffer) == 0:
+                self.__sock.settimeout(idle_timeout)
+            else:
+                if deadline == None and header_timeout != None:
+                    deadline = time.monotonic() + header_timeout
+                if deadline != None:
+                    self.__sock.settimeout(max(deadline - time.monotonic(), 0.001))
+
+            if not self.fill():
+                return None
+
+    @staticmethod
+    def take_head(buffer: bytearray, max_size: int, start: int = 0) -> bytes|None:
+        """Remove a complete request head from the start of a buffer
+
+        Args:
+            buffer (bytearray): Received bytes
+            max_size (int): Max size of the request head in bytes
+            start (int, optional): Offset to start searching the end of the head from. Defaults to 0.
+
+        Raises:
+            Connection.HeadTooLarge: Request head is larger than `max_size`
+
+        Returns:
+            bytes|None: Request head or None if the buffer doesn't contain a whole head yet
+        """
+        # ignore empty lines between pipelined requests
+        while buffer[:1] == b"\n" or buffer[:2] == b"\r\n":
+            del buffer[:buffer.index(b"\n") + 1]
+
+        # the head ends with an empty line, lines end with CRLF or a bare LF (RFC 9112 section 2.2)
+        end = buffer.find(b"\n\r\n", start)
+        if end != -1:
+            end += 3
+        lf = buffer.find(b"\n\n", start, end if end != -1 else len(buffer))
+        if lf != -1:
+            end = lf + 2
+
+        if end == -1:
+            if len(buffer) > max_size:
+                raise Connection.HeadTooLarge()
+            return None
+
+        if end > max_size:
+            raise Connection.HeadTooLarge()
+
+        head = bytes(buffer[:end])
+        del buffer[:end]
+        return head
+
+    @property
+    def buffer(self) -> bytearray:
+        """Bytes received but not consumed yet"""
+        return self.__buffer
+
+    def fill(self, size: int = BUFFER_SIZE) -> bool:
+        """Receive more data into the buffer
+
+        Args:
+            size (int, optional): Max number of bytes to receive. Defaults to BUFFER_SIZE.
+
+        Returns:
+            bool: False if the client closed the connection
+        """
+        data = self.__sock.recv(size)
+        self.__buffer += data
+        return len(data) != 0
+
+    async def fill_async(self, size: int = BUFFER_SIZE) -> bool:
+        """Receive more data into the buffer without blocking the event loop
+
+        Returns:
+            bool: False if the client closed the connection
+        """
+        return await asyncio.to_thread(self.fill, size)
+
+    def recv(self, length: int) -> bytes:
+        """Receive data (buffered bytes first)"""
+        if len(self.__buffer) == 0:
+            return self.__sock.recv(length)
+
+        data = bytes(self.__buffer[:length])
+        del self.__buffer[:length]
+        return data
+
+    def sendall(self, data: bytes):
+        self.__sock.sendall(data)
+
+    def sendmsg(self, buffers) -> int:
+        return self.__sock.sendmsg(buffers)
+
+    def sendfile(self, file, offset: int = 0, count: int = None) -> int:
+        return self.__sock.sendfile(file, offset, count)
+
+    def settimeout(self, value: float|None):
+        self.__sock.settimeout(value)
+
+    def close(self):
+        self.__sock.close()
+
+    class HeadTooLarge(Exception):
+        """Request head is larger than the allowed max size"""
+        pass
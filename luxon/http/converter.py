@@ -0,0 +1,46 @@
+from __future__ import annotations
+from typing import Any, Callable
+import re
+import uuid
+
+class Converter:
+    """Path parameter converter used in route paths like `/users/<int:id>`"""
+    def __init__(self, pattern: str, convert: Callable[[str], Any] = str) -> None:
+        """Create new Converter
+
+        Args:
+            pattern (str): Regular expression the whole segment must match
+            convert (Callable[[str], Any], optional): Function converting the segment to a value. Defaults to `str`.
+        """
+        self.__regex = re.compile(pattern)
+        self.__convert = convert
+
+    @property
+    def regex(self) -> re.Pattern:
+        """Segment regular expression (compiled)"""
+        return self.__regex
+
+    def parse(self, segment: str) -> Any:
+        """Convert path segment
+
+        Args:
+            segment (str): Path segment
+
+        Raises:
+            ValueError: Segment doesn't match the converter
+
+        Returns:
+            Any: Converted value
+        """
+        if self.__regex.fullmatch(segment) == None:
+            raise ValueError(f"Invalid path parameter: {segment!r}")
+        return self.__convert(segment)
+
+CONVERTERS: dict[str, Converter] = {
+    "str":  Converter(r"[^/]+"),
+    "int":  Converter(r"[0-9]+", int),
+    "uuid": Converter(r"[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}", uuid.UUID),
+    "slug": Converter(r"[A-Za-z0-9_-]+"),
+    "path": Converter(r".+")
+}
+"""Path parameter converters by name, `path` matches the rest of the path including slashes"""
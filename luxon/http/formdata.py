@@ -0,0 +1,417 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterable
+from urllib.parse import parse_qsl
+import re
+import shutil
+import tempfile
+from luxon.consts import *
+from luxon.http.headers import Headers, ContentTypeHeader
+
+if TYPE_CHECKING:
+    from luxon.http.body import RequestBody
+
+class UploadedFile:
+    """File part of a multipart form\n
+    Contents are kept in memory up to the spool size and
+    spilled to a temporary file when they grow larger.
+    """
+    def __init__(self, name: str, filename: str, content_type: str, headers: Headers, spool_size: int) -> None:
+        self.__name = name
+        self.__filename = filename
+        self.__content_type = content_type
+        self.__headers = headers
+        self.__file = tempfile.SpooledTemporaryFile(max_size=spool_size)
+        self.__spool_size = spool_size
+        self.__size = 0
+
+    @property
+    def name(self) -> str:
+        """Form field name"""
+        return self.__name
+
+    @property
+    def filename(self) -> str:
+        """File name sent by the client"""
+        return self.__filename
+
+    @property
+    def content_type(self) -> str:
+        """Content type sent by the client"""
+        return self.__content_type
+
+    @property
+    def headers(self) -> Headers:
+        """Part headers"""
+        return self.__headers
+
+    @property
+    def size(self) -> int:
+        """File size in bytes"""
+        return self.__size
+
+    @property
+    def file(self) -> tempfile.SpooledTemporaryFile:
+        """File object with the contents"""
+        return self.__file
+
+    @property
+    def in_memory(self) -> bool:
+        """True if the contents haven't been spilled to disk"""
+        return self.__size <= self.__spool_size
+
+    def write(self, data: bytes):
+        self.__file.write(data)
+        self.__size += len(data)
+
+    def read(self) -> bytes:
+        """Read the whole file
+
+        Returns:
+            bytes
+        """
+        self.__file.seek(0)
+        return self.__file.read()
+
+    def save(self, path: str):
+        """Copy contents to a file
+
+        Args:
+            path (str): Destination path
+        """
+        self.__file.seek(0)
+        with open(path, "wb") as f:
+            shutil.copyfileobj(self.__file, f, FILE_BUFFER_SIZE)
+
+    def close(self):
+        """Close and delete the temporary file"""
+        self.__file.close()
+
+    def __repr__(self) -> str:
+        return f"UploadedFile({self.__name!r}, {self.__filename!r}, {self.__content_type!r}, {self.__size})"
+
+class FormData:
+    """Decoded form (`application/x-www-form-urlencoded` or `multipart/form-data`)\n
+    Forms are parsed incrementally from the request body stream, so memory use
+    is bounded regardless of the upload size.
+    """
+    def __init__(self) -> None:
+        self.__fields: dict[str, str] = {}
+        self.__files: dict[str, UploadedFile] = {}
+        self.__values: dict[str, list[str|UploadedFile]] = {}
+
+    @property
+    def fields(self) -> dict[str, str]:
+        """Text fields (the last value of repeated fields, see `getall`)"""
+        return self.__fields
+
+    @property
+    def files(self) -> dict[str, UploadedFile]:
+        """Uploaded files (the last file of repeated fields, see `getall`)"""
+        return self.__files
+
+    def add(self, name: str, value: str|UploadedFile):
+        """Add field value or uploaded file, repeated names keep every value
+
+        Args:
+            name (str): Field name
+            value (str|UploadedFile): Field value or uploaded file
+        """
+        if isinstance(value, UploadedFile):
+            self.__files[name] = value
+        else:
+            self.__fields[name] = value
+        self.__values.setdefault(name, []).append(value)
+
+    def get(self, name: str, default: str = None) -> str|UploadedFile|None:
+        """Get field value or uploaded file
+
+        Args:
+            name (str): Field name
+            default (str, optional): Returned if the field is not set. Defaults to None.
+
+        Returns:
+            str|UploadedFile|None
+        """
+        if name in self.__fields:
+            return self.__fields[name]
+        return self.__files.get(name, default)
+
+    def __getitem__(self, name: str) -> str|UploadedFile:
+        value = self.get(name)
+        if value == None:
+            raise KeyError(name)
+        return value
+
+    def getall(self, name: str) -> list[str|UploadedFile]:
+        """Get all values of a repeated field (e.g. `a=1&a=2`)
+
+        Args:
+            name (str): Field name
+
+        Returns:
+            list[str|UploadedFile]: Values in the order they were sent, empty if the field is not set
+        """
+        return list(self.__values.get(name, ()))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__fields or name in self.__files
+
+    def close(self):
+        """Delete temporary files of uploaded files"""
+        for values in self.__values.values():
+            for value in values:
+                if isinstance(value, UploadedFile):
+                    value.close()
+
+    @staticmethod
+    def parser(content_type: str, spool_size: int = FORM_SPOOL_SIZE, max_field_size: int = FORM_MAX_FIELD_SIZE) -> FormData.Multipart|FormData.UrlEncoded:
+        """Create parser for form content type
+
+        Args:
+            content_type (str): `Content-Type` header value
+            spool_size (int, optional): Uploaded files larger than this are spilled to disk. Defaults to FORM_SPOOL_SIZE.
+            max_field_size (int, optional): Max size of a text field in bytes. Defaults to FORM_MAX_FIELD_SIZE.
+
+        Raises:
+            ValueError: Not a form content type or boundary is missing
+
+        Returns:
+            FormData.Multipart|FormData.UrlEncoded
+        """
+        header = ContentTypeHeader.parse(content_type or "")
+        type = header.type.lower()
+
+        if type == "application/x-www-form-urlencoded":
+            return FormData.UrlEncoded(max_field_size)
+
+        if type == "multipart/form-data":
+            boundary = header.fields.get("boundary", "").strip('"')
+            if boundary == "":
+                raise ValueError("Multipart boundary is missing")
+            return FormData.Multipart(boundary, spool_size, max_field_size)
+
+        raise ValueError(f"Unsupported form content type: {header.type}")
+
+    @staticmethod
+    def parse(body: RequestBody|Iterable[bytes], content_type: str, spool_size: int = FORM_SPOOL_SIZE, max_field_size: int = FORM_MAX_FIELD_SIZE) -> FormData:
+        """Parse form from request body stream, temporary files are deleted if parsing fails
+
+        Args:
+            body (RequestBody|Iterable[bytes]): Request body
+            content_type (str): `Content-Type` header value
+            spool_size (int, optional): Uploaded files larger than this are spilled to disk. Defaults to FORM_SPOOL_SIZE.
+            max_field_size (int, optional): Max size of a text field in bytes. Defaults to FORM_MAX_FIELD_SIZE.
+
+        Raises:
+            ValueError: Malformed form data
+
+        Returns:
+            FormData
+        """
+        parser = FormData.parser(content_type, spool_size, max_field_size)
+        try:
+            for chunk in body:
+                parser.feed(chunk)
+            return parser.close()
+        except BaseException:
+            parser.abort()
+            raise
+
+    @staticmethod
+    async def parse_async(body: RequestBody, content_type: str, spool_size: int = FORM_SPOOL_SIZE, max_field_size: int = FORM_MAX_FIELD_SIZE) -> FormData:
+        """Parse form from request body stream without blocking the event loop (see `FormData.parse`)"""
+        parser = FormData.parser(content_type, spool_size, max_field_size)
+        try:
+            async for chunk in body:
+                parser.feed(chunk)
+            return parser.close()
+        except BaseException:
+            parser.abort()
+            raise
+
+    class UrlEncoded:
+        """Incremental `application/x-www-form-urlencoded` parser"""
+        def __init__(self, max_field_size: int = FORM_MAX_FIELD_SIZE) -> None:
+            self.__form = FormData()
+            self.__buffer = bytearray()
+            self.__max_field_size = max_field_size
+
+        def feed(self, data: bytes):
+            """Parse more form data"""
+            self.__buffer += data
+
+            end = self.__buffer.rfind(b"&")
+            if end != -1:
+                self.__add(self.__buffer[:end])
+                del self.__buffer[:end + 1]
+
+            if len(self.__buffer) > self.__max_field_size:
+                raise ValueError("Form field too large")
+
+        def close(self) -> FormData:
+            """Finish parsing
+
+            Returns:
+                FormData
+            """
+            self.__add(self.__buffer)
+            self.__buffer.clear()
+            return self.__form
+
+        def abort(self):
+            """Stop parsing after an error"""
+            self.__buffer.clear()
+
+        def __add(self, data: bytearray):
+            for name, value in parse_qsl(data.decode(encoding="utf-8", errors="replace"), keep_blank_values=True):
+                self.__form.add(name, value)
+
+    class Multipart:
+        """Incremental `multipart/form-data` parser"""
+        def __init__(self, boundary: str, spool_size: int = FORM_SPOOL_SIZE, max_field_size: int = FORM_MAX_FIELD_SIZE) -> None:
+            self.__form = FormData()
+            self.__buffer = bytearray()
+            self.__delimiter = b"\r\n--" + boundary.encode(encoding="latin-1")
+            self.__spool_size = spool_size
+            self.__max_field_size = max_field_size
+            self.__state = "preamble"
+            self.__name: str = None
+            self.__field: bytearray = None
+            self.__file: UploadedFile = None
+
+            # the first delimiter doesn't need to be preceded by a line break
+            self.__buffer += b"\r\n"
+
+        def feed(self, data: bytes):
+            """Parse more form data
+
+            Raises:
+                ValueError: Malformed multipart data
+            """
+            self.__buffer += data
+
+            while True:
+                if self.__state == "preamble":
+                    start = self.__buffer.find(self.__delimiter)
+                    if start == -1:
+                        # keep the part that could be the start of the delimiter
+                        del self.__buffer[:max(len(self.__buffer) - len(self.__delimiter), 0)]
+                        return
+                    del self.__buffer[:start + len(self.__delimiter)]
+                    self.__state = "delimiter"
+
+                elif self.__state == "delimiter":
+                    # line break before the next part or "--" after the last one
+                    end = self.__buffer.find(b"\r\n")
+                    if end == -1:
+                        if self.__buffer[:2] == b"--":
+                            self.__state = "end"
+                        elif len(self.__buffer) > BUFFER_SIZE:
+                            raise ValueError("Invalid multipart delimiter")
+                        return
+
+                    line = bytes(self.__buffer[:end]).rstrip(b" \t")
+                    del self.__buffer[:end + 2]
+
+                    if line == b"--":
+                        self.__state = "end"
+                    elif line == b"":
+                        self.__state = "headers"
+                    else:
+                        raise ValueError("Invalid multipart delimiter")
+
+                elif self.__state == "headers":
+                    end = self.__buffer.find(b"\r\n\r\n")
+                    if self.__buffer[:2] == b"\r\n":
+                        end = -2
+                    elif end == -1:
+                        if len(self.__buffer) > MAX_HEAD_SIZE:
+                            raise ValueError("Multipart headers too large")
+                        return
+
+                    self.__begin_part(bytes(self.__buffer[:max(end, 0)]))
+                    del self.__buffer[:end + 4]
+                    self.__state = "data"
+
+                elif self.__state == "data":
+                    end = self.__buffer.find(self.__delimiter)
+                    if end == -1:
+                        # write everything that can't be the start of the delimiter
+                        size = len(self.__buffer) - len(self.__delimiter) + 1
+                        if size > 0:
+                            self.__write(self.__buffer[:size])
+                            del self.__buffer[:size]
+                        return
+
+                    self.__write(self.__buffer[:end])
+                    del self.__buffer[:end + len(self.__delimiter)]
+                    self.__end_part()
+                    self.__state = "delimiter"
+
+                else:
+                    # epilogue is ignored
+                    self.__buffer.clear()
+                    return
+
+        def close(self) -> FormData:
+            """Finish parsing
+
+            Raises:
+                ValueError: Multipart data ended before the last delimiter
+
+            Returns:
+                FormData
+            """
+            if self.__state != "end":
+                self.abort()
+                raise ValueError("Unexpected end of multipart data")
+            return self.__form
+
+        def abort(self):
+            """Stop parsing after an error and delete temporary files"""
+            if self.__file != None:
+                self.__file.close()
+                self.__file = None
+            self.__form.close()
+
+        def __begin_part(self, head: bytes):
+            headers = Headers()
+            for line in head.decode(encoding="utf-8", errors="replace").split("\r\n"):
+                name, sep, value = line.partition(":")
+                if sep != "": headers.add(name.strip(), value.strip())
+
+            disposition = FormData.Multipart.__parse_params(headers.get("Content-Disposition", ""))
+            self.__name = disposition.get("name", "")
+
+            if "filename" in disposition:
+                self.__file = UploadedFile(self.__name, disposition["filename"],
+                    headers.get("Content-Type", "application/octet-stream"), headers, self.__spool_size)
+            else:
+                self.__field = bytearray()
+
+        def __write(self, data: bytearray):
+            if self.__file != None:
+                self.__file.write(data)
+            else:
+                self.__field += data
+                if len(self.__field) > self.__max_field_size:
+                    raise ValueError("Form field too large")
+
+        def __end_part(self):
+            if self.__file != None:
+                self.__file.file.seek(0)
+                self.__form.add(self.__name, self.__file)
+                self.__file = None
+            else:
+                self.__form.add(self.__name, self.__field.decode(encoding="utf-8", errors="replace"))
+                self.__field = None
+
+        @staticmethod
+        def __parse_params(value: str) -> dict[str, str]:
+            """Parse parameters of a header like `Content-Disposition`"""
+            params = {}
+            for name, quoted, token in PARAM_PATTERN.findall(value):
+                params[name.lower()] = re.sub(r'\\(.)', r"\1", quoted) if quoted else token.strip()
+            return params
+
+PARAM_PATTERN = re.compile(r';\s*([^\s=;]+)\s*=\s*(?:"((?:[^"\\]|\\.)*)"|([^;]*))')
@@ -1 +1,3 @@
-from luxon.http.headers.header_contenttype import ContentTypeHeader
\ No newline at end of file
+from luxon.http.headers.headers import Headers
+from luxon.http.headers.header_contenttype import ContentTypeHeader
+from luxon.http.headers.header_acceptencoding import AcceptEncodingHeader
\ No newline at end of file
@@ -0,0 +1,69 @@
+from __future__ import annotations
+from luxon.http.headers.header import Header
+
+class AcceptEncodingHeader(Header):
+    def __init__(self, encodings: dict[str, float]) -> None:
+        self.__encodings = encodings
+
+    @property
+    def encodings(self) -> dict[str, float]:
+        """Accepted encodings and their quality values"""
+        return self.__encodings
+
+    def accepts(self, encoding: str) -> bool:
+        """Check if encoding is acceptable
+
+        Args:
+            encoding (str): Content coding (e.g. `"gzip"`)
+
+        Returns:
+            bool
+        """
+        encoding = encoding.lower()
+
+        if encoding in self.__encodings:
+            return self.__encodings[encoding] > 0
+        if "*" in self.__encodings:
+            return self.__encodings["*"] > 0
+        return encoding == "identity"
+
+    def select(self, *encodings: str) -> str|None:
+        """Select the most preferred acceptable encoding
+
+        Args:
+            *encodings (str): Available encodings in server preference order
+
+        Returns:
+            str|None: Selected encoding or None if none of them is acceptable
+        """
+        best, best_q = None, 0.0
+
+        for encoding in encodings:
+            if not self.accepts(encoding): continue
+
+            q = self.__encodings.get(encoding.lower(), self.__encodings.get("*", 1.0))
+            if q > best_q:
+                best, best_q = encoding, q
+
+        return best
+
+    @staticmethod
+    def parse(text: str) -> AcceptEncodingHeader:
+        encodings = {}
+
+        for part in text.split(","):
+            coding, *params = [s.strip() for s in part.split(";")]
+            if coding == "": continue
+
+            q = 1.0
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip().lower() == "q":
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+
+            encodings[coding.lower()] = q
+
+        return AcceptEncodingHeader(encodings)
\ No newline at end of file
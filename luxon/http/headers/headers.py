@@ -0,0 +1,73 @@
+from __future__ import annotations
+from typing import Iterable
+
+class Headers(dict):
+    """Header dictionary with case-insensitive names\n
+    Iteration yields header names as they were first set.
+    """
+    def __init__(self, items: Iterable[tuple[str, str]] = ()) -> None:
+        super().__init__()
+        self.__names: dict[str, str] = {}
+
+        for name, value in items:
+            self[name] = value
+
+    def __setitem__(self, name: str, value: str):
+        key = name.lower()
+        name = self.__names.setdefault(key, name)
+        super().__setitem__(name, value)
+
+    def __getitem__(self, name: str) -> str:
+        return super().__getitem__(self.__names.get(name.lower(), name))
+
+    def __delitem__(self, name: str):
+        super().__delitem__(self.__names.pop(name.lower(), name))
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.lower() in self.__names
+
+    def get(self, name: str, default: str = None) -> str|None:
+        key = self.__names.get(name.lower())
+        return super().__getitem__(key) if key != None else default
+
+    def pop(self, name: str, *default) -> str|None:
+        key = self.__names.pop(name.lower(), None)
+        if key == None:
+            if len(default) != 0: return default[0]
+            raise KeyError(name)
+        return super().pop(key)
+
+    def setdefault(self, name: str, default: str = None) -> str|None:
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def popitem(self) -> tuple[str, str]:
+        name, value = super().popitem()
+        del self.__names[name.lower()]
+        return name, value
+
+    def clear(self):
+        super().clear()
+        self.__names.clear()
+
+    def update(self, *args, **kwargs):
+        for name, value in dict(*args, **kwargs).items():
+            self[name] = value
+
+    def __ior__(self, other) -> Headers:
+        self.update(other)
+        return self
+
+    def copy(self) -> Headers:
+        return Headers(self.items())
+
+    def add(self, name: str, value: str):
+        """Add header value, repeated headers are joined with a comma
+
+        Args:
+            name (str): Header name
+            value (str): Header value
+        """
+        old = self.get(name)
+        self[name] = value if old == None else f"{old}, {value}"
@@ -0,0 +1,158 @@
+from __future__ import annotations
+from typing import Any, Callable
+import asyncio
+import functools
+import inspect
+from luxon.http.request import Request
+from luxon.http.response import Response
+from luxon.http.route import Route
+
+class Middleware:
+    """Hook run around route handlers (see `App.before`, `App.after` and `App.around`)\n
+    Kinds:
+        - `before`: `func(request, response)` runs before the handler. Returning a value
+            (or sending the headers) short-circuits the chain and the value is written as the response.
+        - `after`: `func(request, response, value)` runs after the handler and returns the value to write.
+        - `around`: `func(request, response, call_next)` calls `call_next()` to run the rest
+            of the chain (awaited on AsyncHttpServer) and returns the value to write.
+    """
+    KINDS = ("before", "after", "around")
+
+    def __init__(self, kind: str, func: Callable, path: str = "/") -> None:
+        """Create new Middleware
+
+        Args:
+            kind (str): `"before"`, `"after"` or `"around"`
+            func (Callable): Hook function (plain or coroutine function)
+            path (str, optional): Only routes under this path prefix run the hook. Defaults to `"/"` (all routes).
+
+        Raises:
+            ValueError: Unknown kind
+        """
+        if kind not in Middleware.KINDS:
+            raise ValueError(f"Unknown middleware kind: {kind}")
+
+        self.__kind = kind
+        self.__func = func
+        self.__path = path.rstrip("/")
+
+    @property
+    def kind(self) -> str:
+        return self.__kind
+
+    @property
+    def func(self) -> Callable:
+        return self.__func
+
+    @property
+    def path(self) -> str:
+        """Path prefix (without trailing slash)"""
+        return self.__path
+
+    def applies(self, route: Route) -> bool:
+        """Check if the hook runs for a route\n
+        Routes with a regular expression pattern only run hooks registered for all paths.
+
+        Args:
+            route (Route): Route
+
+        Returns:
+            bool
+        """
+        if self.__path == "":
+            return True
+        if route.pattern != None:
+            return False
+        return route.path == self.__path or route.path.startswith(self.__path + "/")
+
+    def wrap(self, call: Callable[[Request, Response], Any]) -> Callable[[Request, Response], Any]:
+        """Wrap the rest of the chain (threaded server)
+
+        Args:
+            call (Callable[[Request, Response], Any]): Rest of the chain
+
+        Returns:
+            Callable[[Request, Response], Any]
+        """
+        func = self.__func
+
+        if self.__kind == "before":
+            def before(request: Request, response: Response) -> Any:
+                value = Middleware.__resolve(func(request, response))
+                if value != None or response.headers_sent:
+                    return value
+                return call(request, response)
+            return before
+
+        if self.__kind == "after":
+            def after(request: Request, response: Response) -> Any:
+                return Middleware.__resolve(func(request, response, call(request, response)))
+            return after
+
+        def around(request: Request, response: Response) -> Any:
+            return Middleware.__resolve(func(request, response, functools.partial(call, request, response)))
+        return around
+
+    def wrap_async(self, call: Callable[[Request, Response], Any]) -> Callable[[Request, Response], Any]:
+        """Wrap the rest of the chain (asyncio server), plain hook functions run on the event loop
+
+        Args:
+            call (Callable[[Request, Response], Any]): Rest of the chain (coroutine function)
+
+        Returns:
+            Callable[[Request, Response], Any]: Coroutine function
+        """
+        func = self.__func
+
+        if self.__kind == "before":
+            async def before(request: Request, response: Response) -> Any:
+                value = await Middleware.__resolve_async(func(request, response))
+                if value != None or response.headers_sent:
+                    return value
+                return await call(request, response)
+            return before
+
+        if self.__kind == "after":
+            async def after(request: Request, response: Response) -> Any:
+                return await Middleware.__resolve_async(func(request, response, await call(request, response)))
+            return after
+
+        async def around(request: Request, response: Response) -> Any:
+            return await Middleware.__resolve_async(func(request, response, functools.partial(call, request, response)))
+        return around
+
+    @staticmethod
+    def chain(middleware: list[Middleware], call: Callable[[Request, Response], Any], asynchronous: bool = False) -> Callable[[Request, Response], Any]:
+        """Compile hooks into a single callable, the first hook is the outermost
+
+        Args:
+            middleware (list[Middleware]): Hooks in registration order
+            call (Callable[[Request, Response], Any]): Innermost call (route handler)
+            asynchronous (bool, optional): Compile for AsyncHttpServer (`call` is a coroutine function). Defaults to False.
+
+        Returns:
+            Callable[[Request, Response], Any]
+        """
+        for hook in reversed(middleware):
+            call = hook.wrap_async(call) if asynchronous else hook.wrap(call)
+        return call
+
+    @staticmethod
+    def __resolve(value: Any) -> Any:
+        if inspect.isawaitable(value):
+            # coroutine hook on a threaded server
+            return asyncio.run(Middleware.__await(value))
+        return value
+
+    @staticmethod
+    async def __resolve_async(value: Any) -> Any:
+        if inspect.isawaitable(value):
+            return await value
+        return value
+
+    @staticmethod
+    async def __await(value: Any) -> Any:
+        return await value
+
+    def __repr__(self) -> str:
+        return f"Middleware({self.__kind!r}, {self.__func!r}, {self.__path or '/'!r})"
@@ -0,0 +1,107 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable
+from luxon.http.request import Request
+from luxon.http.response import Response
+
+if TYPE_CHECKING:
+    from luxon.http.app import App
+    from luxon.http.server import HttpServer, AsyncHttpServer
+
+class Mounts:
+    """Apps sharing one server, dispatched by path prefix\n
+    Prefixes are kept in a segment trie and the longest mounted prefix wins,
+    so `/api` handles `/api` and `/api/users` but not `/apix`.
+    """
+    def __init__(self, server: HttpServer|AsyncHttpServer, asynchronous: bool = False) -> None:
+        """Create new Mounts and register its dispatcher on the server
+
+        Args:
+            server (HttpServer|AsyncHttpServer): HTTP server
+            asynchronous (bool, optional): Handlers are coroutine functions (AsyncHttpServer). Defaults to False.
+        """
+        self.__root = Mounts.Node()
+        self.__apps: list[App] = []
+
+        if asynchronous:
+            server.on_request += self.__dispatch_async
+        else:
+            server.on_request += self.__dispatch
+
+    @property
+    def apps(self) -> list[App]:
+        """Mounted apps in mount order"""
+        return self.__apps
+
+    def add(self, path: str, app: App, handler: Callable[[Request, Response], Any]):
+        """Mount app
+
+        Args:
+            path (str): Path prefix
+            app (App): App
+            handler (Callable[[Request, Response], Any]): Request handler of the app
+
+        Raises:
+            ValueError: Another app is mounted on the same path
+        """
+        node = self.__root
+        for segment in Mounts.__segments(path):
+            node = node.children.setdefault(segment, Mounts.Node())
+
+        if node.app != None:
+            raise ValueError(f"Path already mounted: {path}")
+
+        node.app = app
+        node.handler = handler
+        self.__apps.append(app)
+
+    def find(self, path: str) -> Callable[[Request, Response], Any]|None:
+        """Find handler of the app with the longest prefix of a path
+
+        Args:
+            path (str): Request path (without query string)
+
+        Returns:
+            Callable[[Request, Response], Any]|None: Request handler or None if no app is mounted on the path
+        """
+        node = self.__root
+        handler = node.handler
+
+        for segment in Mounts.__segments(path):
+            node = node.children.get(segment)
+            if node == None:
+                break
+            if node.handler != None:
+                handler = node.handler
+
+        return handler
+
+    def __dispatch(self, request: Request, response: Response):
+        handler = self.find(request.path)
+        if handler == None:
+            Mounts.__not_found(response)
+            return
+        handler(request, response)
+
+    async def __dispatch_async(self, request: Request, response: Response):
+        handler = self.find(request.path)
+        if handler == None:
+            Mounts.__not_found(response)
+            return
+        await handler(request, response)
+
+    @staticmethod
+    def __segments(path: str) -> list[str]:
+        return [segment for segment in path.split("/") if segment != ""]
+
+    @staticmethod
+    def __not_found(response: Response):
+        response.status.code = 404
+        response.status.message = "Route Not Found"
+        response.write_all(b"Route Not Found")
+
+    class Node:
+        """Prefix trie node"""
+        def __init__(self) -> None:
+            self.children: dict[str, Mounts.Node] = {}
+            self.app: App = None
+            self.handler: Callable[[Request, Response], Any] = None
@@ -1,41 +1,89 @@
 from __future__ import annotations
-from typing import Any
-from urllib.parse import urlparse, parse_qsl, unquote
+from typing import Any, Callable
+from urllib.parse import parse_qsl, unquote
 import re
 import json
+import codecs
 import socket
+from email.utils import parsedate_to_datetime
 from luxon.consts import *
+from luxon.http.headers import Headers, ContentTypeHeader
+from luxon.http.connection import Connection
+from luxon.http.body import RequestBody
+from luxon.http.formdata import FormData
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Requests with body/payload (like 'POST') must include 
 # 'Content-Length' header or use 'Transfer-Encoding: chunked'. 
 # https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Transfer-Encoding 
 
 class Request:
-    def __init__(self, socket: socket.socket) -> None:
+    json_loads: Callable[[bytes|str], Any] = orjson.loads if orjson != None else json.loads
+    """Function used by `Request.json` to decode JSON (orjson when it's installed)"""
+
+    def __init__(self, socket: socket.socket, head: bytes = None, max_body_size: int = None) -> None:
+        """Create new Request and read request headers from the socket
+
+        Args:
+            socket (socket.socket): Client socket or buffered connection
+            head (bytes, optional): Request line and headers if they were already read. Defaults to None.
+            max_body_size (int, optional): Max request body size in bytes. Defaults to None (no limit).
+
+        Raises:
+            ValueError: Malformed request line
+        """
         self.__sock = socket
-        self.__method: str = None
-        self.__path: str = None
-        self.__query: dict[str, str] = None
-        self.__version: str = None
-        self.__headers: dict[str, str] = {}
+        self.__max_body_size = max_body_size
+
+        # Body is read through a buffered connection
+        self.__connection = socket
+        if socket != None and not hasattr(socket, "buffer"):
+            self.__connection = Connection(socket, None)
+
+        self.reset(head)
+
+    def reset(self, head: bytes = None):
+        """Reuse this object for the next request on the same connection (called by the servers).\n
+        Handlers shouldn't keep references to the request after they return.
+
+        Args:
+            head (bytes, optional): Request line and headers if they were already read. Defaults to None.
+
+        Raises:
+            ValueError: Malformed request line
+        """
         self.__groups: tuple[re.Match] = None
-        self.__body: Any = None
+        self.__params: dict[str, Any] = {}
+        self.__body: RequestBody = None
+        self.__content: bytes = None
+        self.__text: str = None
+        self.__json: Any = None
+        self.__json_loaded = False
+        self.__form: FormData = None
 
-        # Read request headers
-        with self.__sock.makefile("r", buffering=BUFFER_SIZE, encoding="utf-8", newline="\n") as f:
-            self.__method, self.__path, self.__version = f.readline().split(" ")
+        if head == None:
+            head = self.__connection.read_head(MAX_HEAD_SIZE)
+            if head == None:
+                raise ConnectionError("Connection closed before the request head was received")
 
-            while True:
-                line = f.readline().strip()
-                if line == "": break
+        # Parse request line, headers are parsed on first access
+        self.__head = head
+        self.__headers: Headers = None
+        line_end = head.find(b"\n")
+        self.__headers_start = line_end + 1
 
-                header, value = line.split(": ")
-                self.__headers[header] = value
+        self.__method, target, self.__version = head[:line_end].rstrip(b"\r").decode(encoding="utf-8").split(" ")
+        if not self.__version.startswith("HTTP/"):
+            raise ValueError("Invalid HTTP version")
 
-        # Parse and unquote path and query string
-        url = urlparse(self.__path)
-        self.__path = unquote(url.path)
-        self.__query = dict(parse_qsl(url.query))
+        # Unquote path, query string is parsed on first access
+        path, _, self.__query_string = target.partition("?")
+        self.__path = unquote(path.partition("#")[0])
+        self.__query: dict[str, str] = None
 
     @property
     def socket(self) -> socket.socket:
@@ -60,13 +108,65 @@ class Request:
     @property
     def query(self) -> dict[str, str]:
         """HTTP query string"""
+        if self.__query == None:
+            self.__query = dict(parse_qsl(self.__query_string.partition("#")[0]))
         return self.__query
 
     @property
-    def headers(self) -> dict[str, str]:
-        """Request headers"""
+    def headers(self) -> Headers:
+        """Request headers (case-insensitive)"""
+        if self.__headers == None:
+            self.__headers = Request.__parse_headers(self.__head, self.__headers_start)
         return self.__headers
 
+    @property
+    def keep_alive(self) -> bool:
+        """True if the client wants to keep the connection open after this request"""
+        connection = (self.get_header("Connection") or "").lower()
+
+        if self.__version == "HTTP/1.0":
+            return "keep-alive" in connection
+        return "close" not in connection
+
+    def get_header(self, name: str, default: str = None) -> str|None:
+        """Get request header value (case-insensitive)
+
+        Args:
+            name (str): Header name
+            default (str, optional): Returned if the header is not set. Defaults to None.
+
+        Returns:
+            str|None
+        """
+        return self.headers.get(name, default)
+
+    def not_modified(self, etag: str, mtime: float) -> bool:
+        """Check conditional request headers (`If-None-Match`, `If-Modified-Since`)
+
+        Args:
+            etag (str): Current entity tag of the resource
+            mtime (float): Current modification time of the resource (timestamp)
+
+        Returns:
+            bool: True if the client's copy is up to date (respond with 304)
+        """
+        if self.__method not in ("GET", "HEAD"):
+            return False
+
+        if_none_match = self.get_header("If-None-Match")
+        if if_none_match != None:
+            tags = [t.strip() for t in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+        if_modified_since = self.get_header("If-Modified-Since")
+        if if_modified_since != None:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+
+        return False
+
     @property
     def groups(self) -> tuple[re.Match]:
         """Path regular expression groups"""
@@ -77,18 +177,163 @@ class Request:
         self.__groups = value
 
     @property
-    def body(self) -> Any:
-        """Request body"""
+    def params(self) -> dict[str, Any]:
+        """Path parameters of the matched route"""
+        return self.__params
+
+    @params.setter
+    def params(self, value: dict[str, Any]):
+        self.__params = value
+
+    @property
+    def body(self) -> RequestBody:
+        """Request body stream
+
+        Raises:
+            RequestBody.Invalid: Invalid `Content-Length` or `Transfer-Encoding`
+            RequestBody.TooLarge: Body is larger than the max body size
+        """
+        if self.__body == None:
+            self.__body = RequestBody(self.__connection, self.headers, self.__max_body_size)
         return self.__body
 
     def read(self, length: int = BUFFER_SIZE) -> bytes:
-        """Read data from socket associated with this request. 
+        """Read request body. 
         The amount of bytes read can be smaller than the buffer size.
 
         Args:
             length (int, optional): Buffer length. Defaults to BUFFER_SIZE.
 
+        Returns:
+            bytes: Data or empty bytes at the end of the body
+        """
+        return self.body.read(length)
+
+    def readinto(self, buffer: bytearray|memoryview) -> int:
+        """Read request body into a buffer
+
+        Args:
+            buffer (bytearray|memoryview): Writable buffer
+
+        Returns:
+            int: Number of bytes read, 0 at the end of the body
+        """
+        return self.body.readinto(buffer)
+
+    @property
+    def charset(self) -> str:
+        """Charset of the request body from `Content-Type` (defaults to UTF-8, also used for unknown charsets)"""
+        content_type = self.get_header("Content-Type")
+        if content_type != None:
+            charset = ContentTypeHeader.parse(content_type).fields.get("charset")
+            if charset != None:
+                charset = charset.strip('"')
+                try:
+                    # skip codecs that don't decode to text (e.g. base64) like bytes.decode does
+                    if getattr(codecs.lookup(charset), "_is_text_encoding", True):
+                        return charset
+                except LookupError:
+                    pass
+        return "utf-8"
+
+    def content(self) -> bytes:
+        """Read the whole request body (read once, then cached)
+
+        Returns:
+            bytes
+        """
+        if self.__content == None:
+            self.__content = self.body.read()
+        return self.__content
+
+    async def content_async(self) -> bytes:
+        """Read the whole request body without blocking the event loop (read once, then cached)
+
         Returns:
             bytes
         """
-        return self.__sock.recv(length)
\ No newline at end of file
+        if self.__content == None:
+            self.__content = await self.body.read_async()
+        return self.__content
+
+    def text(self) -> str:
+        """Request body decoded using the charset from `Content-Type` (decoded once, then cached)
+
+        Raises:
+            UnicodeDecodeError: Body doesn't match the charset
+
+        Returns:
+            str
+        """
+        if self.__text == None:
+            self.__text = self.content().decode(encoding=self.charset)
+        return self.__text
+
+    def json(self) -> Any:
+        """Request body decoded as JSON (decoded once, then cached)
+
+        Raises:
+            ValueError: Body is not valid JSON
+
+        Returns:
+            Any
+        """
+        if not self.__json_loaded:
+            charset = self.charset.lower().replace("_", "-")
+            self.__json = Request.json_loads(self.content() if charset in ("utf-8", "utf8") else self.text())
+            self.__json_loaded = True
+        return self.__json
+
+    def form(self) -> FormData:
+        """Request body decoded as form data (decoded once, then cached).\n
+        Uploaded files are streamed from the connection if the body hasn't been read yet.
+
+        Raises:
+            ValueError: Body is not a valid form
+
+        Returns:
+            FormData
+        """
+        if self.__form == None:
+            if self.__content != None:
+                self.__form = FormData.parse((self.__content,), self.get_header("Content-Type"))
+            else:
+                self.__form = FormData.parse(self.body, self.get_header("Content-Type"))
+        return self.__form
+
+    async def text_async(self) -> str:
+        """Request body as text without blocking the event loop (see `Request.text`)"""
+        await self.content_async()
+        return self.text()
+
+    async def json_async(self) -> Any:
+        """Request body as JSON without blocking the event loop (see `Request.json`)"""
+        await self.content_async()
+        return self.json()
+
+    async def form_async(self) -> FormData:
+        """Request body as form data without blocking the event loop (see `Request.form`)"""
+        if self.__form == None and self.__content == None:
+            self.__form = await FormData.parse_async(self.body, self.get_header("Content-Type"))
+        return self.form()
+
+    @staticmethod
+    def __parse_headers(head: bytes, start: int) -> Headers:
+        """Parse header lines of a request head"""
+        try:
+            text = head[start:].decode(encoding="utf-8")
+        except UnicodeDecodeError:
+            text = head[start:].decode(encoding="latin-1")
+
+        headers = Headers()
+        for line in text.split("\n"):
+            line = line.strip()
+            if line == "": continue
+
+            name, sep, value = line.partition(":")
+            if sep == "":
+                raise ValueError(f"Invalid header line: {line!r}")
+
+            headers.add(name.strip(), value.strip())
+
+        return headers
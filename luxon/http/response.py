@@ -1,23 +1,58 @@
 from __future__ import annotations
+import os
 import socket
 import mimetypes
+import secrets
+from typing import Iterator
+from email.utils import formatdate
+from luxon.consts import *
+from luxon.http.request import Request
+from luxon.http.compression import Compression
 
 class Response:
-    def __init__(self, socket: socket.socket) -> None:
+    DEFAULT_HEADERS: dict[str, str|int] = {
+        "Server":       "Luxon",
+        "Connection":   "keep-alive",
+        "Content-Type": "text/html; charset=utf-8"
+    }
+    """Headers every response starts with (shared until a response changes its headers)"""
+
+    def __init__(self, socket: socket.socket, request: Request = None) -> None:
+        """Create new Response
+
+        Args:
+            socket (socket.socket): Client socket
+            request (Request, optional): Request this response is for. Defaults to None.
+        """
         self.__sock = socket
         self.__status = Response.Status()
-        self.__headers: dict[str, str|int] = {
-            "Server":       "Luxon",
-            "Connection":   "keep-alive",
-            "Content-Type": "text/html; charset=utf-8"
-        }
+        self.reset(request)
+
+    def reset(self, request: Request = None):
+        """Reuse this object for the next response on the same connection (called by the servers)
+
+        Args:
+            request (Request, optional): Request this response is for. Defaults to None.
+        """
+        self.__request = request
+        self.__status.code = 200
+        self.__headers = Response.DEFAULT_HEADERS
+        self.__headers_shared = True
         self.__headers_sent = False
+        self.__compression: Compression = None
+        self.__stream: Compression.Stream = None
+        self.__chunked = False
 
     @property
     def socket(self) -> socket.socket:
         """Socket associated with this response"""
         return self.__sock
 
+    @property
+    def request(self) -> Request|None:
+        """Request this response is for"""
+        return self.__request
+
     @property
     def status(self) -> Response.Status:
         """Response status"""
@@ -25,21 +60,84 @@ class Response:
 
     @property
     def headers(self) -> dict[str, str|int]:
-        """Response headers"""
+        """Response headers (copied from the default headers on first access)"""
+        if self.__headers_shared:
+            self.__headers = dict(self.__headers)
+            self.__headers_shared = False
         return self.__headers
 
-    def __send_line(self, header: str):
-        self.socket.send(f"{header}\r\n".encode(encoding="utf-8"))
+    def get_header(self, name: str, default: str|int = None) -> str|int|None:
+        """Get response header value without copying the default headers
 
-    def __send_headers(self):
-        if not self.__headers_sent:
-            self.__send_line(f"HTTP/1.1 {self.__status.code} {self.__status.message}")
+        Args:
+            name (str): Header name
+            default (str|int, optional): Returned if the header is not set. Defaults to None.
+
+        Returns:
+            str|int|None
+        """
+        return self.__headers.get(name, default)
+
+    @property
+    def headers_sent(self) -> bool:
+        """True if the status line and headers have been sent"""
+        return self.__headers_sent
+
+    @property
+    def compression(self) -> Compression|None:
+        """Response compression settings or None if compression is disabled"""
+        return self.__compression
+
+    @compression.setter
+    def compression(self, value: Compression|None):
+        self.__compression = value
+
+    def __build_head(self) -> bytes:
+        """Encode status line and headers into one buffer, common lines are preencoded"""
+        code, message = self.__status.code, self.__status.message
+        status = STATUS_LINES.get(code)
+        if status == None or message != STATUS_CODES[code]:
+            status = f"HTTP/1.1 {code} {message}\r\n".encode(encoding="utf-8")
+
+        lines = [status]
+        for item in self.__headers.items():
+            try:
+                line = HEADER_LINES.get(item)
+            except TypeError:
+                # unhashable header value
+                line = None
+            lines.append(line if line != None else f"{item[0]}: {item[1]}\r\n".encode(encoding="utf-8"))
+
+        lines.append(b"\r\n")
+        return b"".join(lines)
 
-            for header, value in self.__headers.items():
-                self.__send_line(f"{header}: {value}")
-                
-            self.__send_line("")
+    def __send_headers(self, body: bytes = b""):
+        """Send response head (and the first part of the body) with as few syscalls as possible"""
+        if not self.__headers_sent:
             self.__headers_sent = True
+            self.__send(self.__build_head(), body)
+
+    def __send(self, head: bytes, body: bytes):
+        if len(body) <= COALESCE_SIZE:
+            # small body: copy it after the head
+            self.socket.sendall(head + body)
+            return
+
+        if not hasattr(self.socket, "sendmsg"):
+            self.socket.sendall(head)
+            self.socket.sendall(body)
+            return
+
+        # large body: scatter-gather write without copying
+        buffers = [memoryview(head), memoryview(body)]
+        while len(buffers) != 0:
+            sent = self.socket.sendmsg(buffers)
+            while sent > 0:
+                if sent >= len(buffers[0]):
+                    sent -= len(buffers.pop(0))
+                else:
+                    buffers[0] = buffers[0][sent:]
+                    sent = 0
 
     def send_headers(self):
         """Send response headers
@@ -54,40 +152,270 @@ class Response:
         Args:
             data (str | bytes | Tag | None): Response body data or None if empty response
         """
+        if not self.__headers_sent and "Content-Length" not in self.__headers and "Transfer-Encoding" not in self.__headers:
+            if self.__request != None and self.__request.version == "HTTP/1.1":
+                # Streamed response, send it in chunks (compressed incrementally if negotiated)
+                encoding = self.__negotiate(None)
+                if encoding != None:
+                    self.__stream = Compression.Stream(encoding, self.__compression.level)
+                    self.headers["Content-Encoding"] = encoding
+                self.headers["Transfer-Encoding"] = "chunked"
+                self.__chunked = True
+            else:
+                # Body ends when the connection is closed
+                self.headers["Connection"] = "close"
+
+        if self.__stream != None:
+            data = self.__stream.compress(data)
+
+        if self.__chunked and len(data) != 0:
+            data = b"%x\r\n%b\r\n" % (len(data), data)
+
         if not self.__headers_sent:
             # Send response status and headers 
-            # if they're not sent yet
-            self.send_headers()
-
-        # Write response body
-        self.socket.send(data)
+            # together with the first body data
+            self.__send_headers(data)
+        elif len(data) != 0:
+            # Write response body
+            self.socket.sendall(data)
 
     def write_all(self, data: bytes):
+        """Write the whole response body (sets `Content-Length`)
+
+        Args:
+            data (bytes): Response body
+        """
+        encoding = self.__negotiate(len(data))
+        if encoding != None:
+            data = Compression.compress(data, encoding, self.__compression.level)
+            self.headers["Content-Encoding"] = encoding
+
         self.headers["Content-Length"] = len(data)
         self.write(data)
 
+    def end(self):
+        """Finish response (called by the server after the request handlers).\n
+        Sends an empty response if nothing was written and ends streamed responses.
+        """
+        if not self.__headers_sent:
+            self.write_all(b"")
+            return
+
+        if self.__stream != None:
+            data = self.__stream.finish()
+            self.__stream = None
+            if len(data) != 0:
+                self.socket.sendall(b"%x\r\n%b\r\n" % (len(data), data))
+
+        if self.__chunked:
+            self.socket.sendall(b"0\r\n\r\n")
+            self.__chunked = False
+
+    def __negotiate(self, size: int|None) -> str|None:
+        """Select content coding for the response body or None if it should not be compressed"""
+        if self.__compression == None or self.__request == None or self.__headers_sent:
+            return None
+        if self.__request.method == "HEAD" or self.__status.code < 200 or self.__status.code in (204, 206, 304):
+            return None
+        if "Content-Encoding" in self.__headers or "Content-Range" in self.__headers:
+            return None
+        if size != None and size < self.__compression.min_size:
+            return None
+
+        content_type = self.__headers.get("Content-Type")
+        if Compression.compressible(content_type):
+            vary = self.__headers.get("Vary")
+            if vary == None:
+                self.headers["Vary"] = "Accept-Encoding"
+            elif "accept-encoding" not in str(vary).lower():
+                self.headers["Vary"] = f"{vary}, Accept-Encoding"
+
+        return self.__compression.negotiate(self.__request, content_type)
+
     def send_file(self, path: str):
-        """Send file to client
+        """Send file to client\n
+        Supports conditional requests (`If-None-Match`, `If-Modified-Since`) 
+        and byte ranges (`Range`, `If-Range`) when the response has a request.
+        Coroutine handlers on AsyncHttpServer use `send_file_async`.
 
         Args:
             path (str): Path to file
         """
+        if not getattr(self.socket, "blocking", True):
+            raise Exception("Blocking file transfers are not allowed on the event loop thread, use send_file_async")
+
         with open(path, "rb") as f:
-            type, encoding = mimetypes.guess_type(path)
-            self.headers["Content-Type"] = type if type != None else "application/octet-stream"
-            f.seek(0, 2) # seek to end
-            self.headers["Content-Length"] = f.tell()
+            for part in self.__file_parts(f, path):
+                if isinstance(part, bytes):
+                    self.socket.sendall(part)
+                else:
+                    self.__send_file(f, *part)
+
+    async def send_file_async(self, path: str):
+        """Send file to client without blocking the event loop (see `send_file`)\n
+        Data is flushed to the client as it is sent so large files aren't buffered in memory.
+
+        Args:
+            path (str): Path to file
+        """
+        with open(path, "rb") as f:
+            for part in self.__file_parts(f, path):
+                if isinstance(part, bytes):
+                    await self.__sendall_async(part)
+                else:
+                    await self.__send_file_async(f, *part)
+
+    def __file_parts(self, f, path: str) -> Iterator[bytes|tuple[int, int]]:
+        """Set file response status and headers, send the head and
+        yield the body as bytes and `(offset, count)` parts of the file"""
+        stat = os.fstat(f.fileno())
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+        type, encoding = mimetypes.guess_type(path)
+        content_type = type if type != None else "application/octet-stream"
+        self.headers["Content-Type"] = content_type
+        self.headers["ETag"] = etag
+        self.headers["Last-Modified"] = last_modified
+        self.headers["Accept-Ranges"] = "bytes"
+
+        request = self.__request
+        head = request != None and request.method == "HEAD"
+
+        # Conditional request
+        if request != None and request.not_modified(etag, stat.st_mtime):
+            self.status.code = 304
+            del self.headers["Content-Type"]
             self.__send_headers()
+            return
 
-            f.seek(0, 0) # seek to beginning
+        ranges = None
+        if request != None and request.get_header("Range") != None and self.status.code == 200:
+            if_range = request.get_header("If-Range")
+            if if_range == None or if_range == etag or if_range == last_modified:
+                ranges = Response.__parse_ranges(request.get_header("Range"), size)
 
-            while True:
-                buffer = f.read(2048)
+        if ranges == None:
+            # Whole file
+            self.headers["Content-Length"] = size
+            self.__send_headers()
+            if not head: yield (0, size)
+
+        elif len(ranges) == 0:
+            # Range Not Satisfiable
+            self.status.code = 416
+            self.headers["Content-Range"] = f"bytes */{size}"
+            self.headers["Content-Length"] = 0
+            self.__send_headers()
+
+        elif len(ranges) == 1:
+            # Single part
+            begin, end = ranges[0]
+            self.status.code = 206
+            self.headers["Content-Range"] = f"bytes {begin}-{end}/{size}"
+            self.headers["Content-Length"] = end - begin + 1
+            self.__send_headers()
+            if not head: yield (begin, end - begin + 1)
+
+        else:
+            # Multipart byte ranges
+            boundary = secrets.token_hex(16)
+            parts = [(
+                f"--{boundary}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Range: bytes {begin}-{end}/{size}\r\n\r\n").encode(encoding="utf-8")
+                for begin, end in ranges]
+            closing = f"--{boundary}--\r\n".encode(encoding="utf-8")
+
+            self.status.code = 206
+            self.headers["Content-Type"] = f"multipart/byteranges; boundary={boundary}"
+            self.headers["Content-Length"] = sum(len(part) + end - begin + 3 for part, (begin, end) in zip(parts, ranges)) + len(closing)
+            self.__send_headers()
 
-                if not buffer: 
-                    break
+            if not head:
+                for part, (begin, end) in zip(parts, ranges):
+                    yield part
+                    yield (begin, end - begin + 1)
+                    yield b"\r\n"
+                yield closing
 
-                self.write(buffer)
+    @staticmethod
+    def __parse_ranges(header: str, size: int) -> list[tuple[int, int]]|None:
+        """Parse `Range` header
+
+        Returns:
+            list[tuple[int, int]]|None: Inclusive byte ranges, empty list if not satisfiable or None if invalid
+        """
+        unit, _, specs = header.partition("=")
+        if unit.strip().lower() != "bytes" or specs.strip() == "":
+            return None
+
+        ranges = []
+        for spec in specs.split(","):
+            begin, sep, end = spec.strip().partition("-")
+            if sep == "": return None
+
+            try:
+                if begin == "":
+                    # Suffix range (last n bytes)
+                    length = int(end)
+                    if length <= 0: continue
+                    begin, end = max(size - length, 0), size - 1
+                else:
+                    begin = int(begin)
+                    end = int(end) if end != "" else None
+                    if end != None and end < begin: return None
+                    if begin >= size: continue
+                    end = size - 1 if end == None else min(end, size - 1)
+
+                # empty range (suffix range of an empty file)
+                if begin > end: continue
+                ranges.append((begin, end))
+            except ValueError:
+                return None
+
+        if len(ranges) > MAX_RANGES:
+            return None
+
+        return ranges
+
+    def __send_file(self, f, offset: int, count: int):
+        """Send part of an open file using sendfile (zero-copy) when possible"""
+        if count <= 0: return
+
+        if hasattr(self.socket, "sendfile"):
+            try:
+                self.socket.sendfile(f, offset, count)
+                return
+            except (AttributeError, NotImplementedError, ValueError):
+                # not a regular file or not supported by the socket
+                pass
+
+        # fallback: large buffered writes
+        f.seek(offset)
+        while count > 0:
+            buffer = f.read(min(FILE_BUFFER_SIZE, count))
+
+            if not buffer: 
+                break
+
+            self.socket.sendall(buffer)
+            count -= len(buffer)
+
+    async def __send_file_async(self, f, offset: int, count: int):
+        if count <= 0: return
+
+        if hasattr(self.socket, "sendfile_async"):
+            await self.socket.sendfile_async(f, offset, count)
+        else:
+            # not an asyncio socket (coroutine handler on a threaded server)
+            self.__send_file(f, offset, count)
+
+    async def __sendall_async(self, data: bytes):
+        if hasattr(self.socket, "sendall_async"):
+            await self.socket.sendall_async(data)
+        else:
+            self.socket.sendall(data)
 
     class Status:
         def __init__(self, code: int = 200, message: str = None) -> None:
@@ -95,9 +423,7 @@ class Response:
             self.__message = message
 
             if message == None:
-                _message = self.__get_message(code)
-                if _message != None:
-                    self.__message = _message
+                self.__message = STATUS_CODES.get(code)
 
         @property
         def code(self) -> int:
@@ -108,7 +434,7 @@ class Response:
         def code(self, value: int):
             self.__code = value
 
-            message = self.__get_message(value)
+            message = STATUS_CODES.get(value)
             if message != None:
                 self.__message = message
 
@@ -121,12 +447,6 @@ class Response:
         def message(self, value: str):
             self.__message = value
 
-        def __get_message(self, code: int) -> str|None:
-            for key, value in STATUS_CODES.items():
-                if key == code:
-                    return value
-            return None
-
 STATUS_CODES = {
     100: 'Continue',
     101: 'Switching Protocols',
@@ -191,4 +511,20 @@ STATUS_CODES = {
     509: 'Bandwidth Limit Exceeded',
     510: 'Not Extended',
     511: 'Network Authentication Required'
-}
\ No newline at end of file
+}
+
+STATUS_LINES: dict[int, bytes] = {
+    code: f"HTTP/1.1 {code} {message}\r\n".encode(encoding="utf-8") for code, message in STATUS_CODES.items()}
+"""Encoded status lines by status code"""
+
+HEADER_LINES: dict[tuple[str, str|int], bytes] = {
+    (header, value): f"{header}: {value}\r\n".encode(encoding="utf-8") for header, value in [
+        *Response.DEFAULT_HEADERS.items(),
+        ("Connection", "close"),
+        ("Content-Type", "text/plain; charset=utf-8"),
+        ("Content-Type", "application/json"),
+        ("Content-Length", 0),
+        ("Transfer-Encoding", "chunked"),
+        ("Vary", "Accept-Encoding"),
+        ("Accept-Ranges", "bytes")]}
+"""Encoded header lines of common response headers by (name, value)"""
\ No newline at end of file
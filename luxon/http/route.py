@@ -1,16 +1,54 @@
 from __future__ import annotations
 import re
 from typing import Any, Callable
+import inspect
 from luxon.http.request import Request
 from luxon.http.response import Response
+from luxon.http.converter import CONVERTERS
 
 class Route:
-    def __init__(self, *, method: str = "GET", path: str = "/", pattern: str = None, handler: Callable[[Request, Response], Any] = None) -> None:
-        """Create new Route"""
+    def __init__(self, *, method: str = "GET", path: str = "/", pattern: str = None, handler: Callable[[Request, Response], Any] = None,
+                 cache: float = None, vary: tuple[str, ...] = ()) -> None:
+        """Create new Route
+
+        Args:
+            method (str, optional): HTTP method. Defaults to `"GET"`.
+            path (str, optional): HTTP path, segments like `<name>` or `<int:name>` are path parameters. Defaults to `"/"`.
+            pattern (str, optional): Regular expression pattern. Defaults to None.
+            handler (Callable[[Request, Response], Any], optional): Route handler. Defaults to None.
+            cache (float, optional): Seconds the response is cached for. Defaults to None (not cached).
+            vary (tuple[str, ...], optional): Request headers that are part of the cache key. Defaults to ().
+
+        Raises:
+            ValueError: Unknown converter or `path` parameter that is not the last segment
+        """
         self.__method: str = method.upper()
         self.__path: str = path
         self.__pattern = re.compile(pattern) if pattern != None else None
         self.__handler: Callable = handler
+        self.__cache = cache
+        self.__vary = tuple(vary)
+        self.__segments: list[str|tuple[str, str]] = []
+        self.__params: list[str] = []
+
+        if pattern == None:
+            segments = path.split("/")
+            for i, segment in enumerate(segments):
+                if not (segment.startswith("<") and segment.endswith(">")):
+                    self.__segments.append(segment)
+                    continue
+
+                converter, _, name = segment[1:-1].rpartition(":")
+                converter = converter or "str"
+                if converter not in CONVERTERS:
+                    raise ValueError(f"Unknown path parameter converter: {converter}")
+                if converter == "path" and i != len(segments) - 1:
+                    raise ValueError("Path parameter of type 'path' must be the last segment")
+
+                self.__segments.append((converter, name))
+                self.__params.append(name)
+
+        self.__bind_params = len(self.__params) != 0 and Route.__accepts(handler, self.__params)
 
     @property
     def method(self) -> str:
@@ -27,6 +65,45 @@ class Route:
         """Path regular expression (compiled)"""
         return self.__pattern
 
+    @property
+    def params(self) -> list[str]:
+        """Names of path parameters"""
+        return self.__params
+
+    @property
+    def segments(self) -> list[str|tuple[str, str]]:
+        """Path segments, parameters are (converter, name) tuples"""
+        return self.__segments
+
+    @property
+    def cache(self) -> float|None:
+        """Seconds the response is cached for or None if it's not cached"""
+        return self.__cache
+
+    @property
+    def vary(self) -> tuple[str, ...]:
+        """Request headers that are part of the cache key"""
+        return self.__vary
+
+    @property
+    def bind_params(self) -> bool:
+        """True if path parameters are passed to the handler as keyword arguments"""
+        return self.__bind_params
+
     @property
     def handler(self) -> Callable[[Request, Response], Any]:
-        return self.__handler
\ No newline at end of file
+        return self.__handler
+
+    @staticmethod
+    def __accepts(handler: Callable, names: list[str]) -> bool:
+        """Check if handler takes the path parameters as keyword arguments"""
+        try:
+            parameters = inspect.signature(handler).parameters.values()
+        except (TypeError, ValueError):
+            return False
+
+        if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters):
+            return True
+
+        accepted = {p.name for p in parameters if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)}
+        return all(name in accepted for name in names)
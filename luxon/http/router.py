@@ -0,0 +1,207 @@
+from __future__ import annotations
+from typing import Any
+import re
+from luxon.http.route import Route
+from luxon.http.converter import CONVERTERS
+
+class Router:
+    """Route table compiled for fast dispatch\n
+    Static paths are looked up in a dict, paths with parameters (`<name>`, `<int:name>`) in a
+    segment trie and regex patterns anchored with `^` are combined into one
+    alternation per method and literal first path segment. The route registered
+    first wins when several match.
+    """
+    def __init__(self) -> None:
+        self.__routes: list[Route] = []
+        self.__compiled = False
+        self.__static: dict[tuple[str, str], int] = {}
+        self.__tries: dict[str, Router.Node] = {}
+        self.__combined: dict[tuple[str, str|None], tuple[re.Pattern, list[tuple[int, int, int]]]] = {}
+        self.__patterns: dict[str, list[int]] = {}
+
+    @property
+    def routes(self) -> list[Route]:
+        """Routes in registration order"""
+        return self.__routes
+
+    def add(self, route: Route):
+        """Add route (the table is recompiled on the next match)
+
+        Args:
+            route (Route): Route
+        """
+        self.__routes.append(route)
+        self.__compiled = False
+
+    def compile(self):
+        """Build lookup tables"""
+        static: dict[tuple[str, str], int] = {}
+        tries: dict[str, Router.Node] = {}
+        anchored: dict[tuple[str, str|None], list[int]] = {}
+        patterns: dict[str, list[int]] = {}
+
+        for index, route in enumerate(self.__routes):
+            if route.pattern != None:
+                if Router.__combinable(route.pattern):
+                    key = (route.method, Router.__first_segment(route.pattern))
+                    anchored.setdefault(key, []).append(index)
+                else:
+                    patterns.setdefault(route.method, []).append(index)
+
+            elif len(route.params) != 0:
+                node = tries.setdefault(route.method, Router.Node())
+                for segment in route.segments:
+                    if type(segment) == tuple:
+                        node = node.params.setdefault(segment[0], Router.Node())
+                    else:
+                        node = node.children.setdefault(segment, Router.Node())
+                if node.index == None:
+                    node.index = index
+
+            else:
+                static.setdefault((route.method, route.path), index)
+
+        combined: dict[tuple[str, str|None], tuple[re.Pattern, list[tuple[int, int, int]]]] = {}
+        for key, indexes in anchored.items():
+            try:
+                combined[key] = self.__combine(indexes)
+            except re.error:
+                # e.g. the same group name in two patterns
+                patterns[key[0]] = sorted(patterns.get(key[0], []) + indexes)
+
+        self.__static = static
+        self.__tries = tries
+        self.__combined = combined
+        self.__patterns = patterns
+        self.__compiled = True
+
+    def match(self, method: str, path: str) -> tuple[Route, tuple, dict[str, Any]]|None:
+        """Find the first route matching a request
+
+        Args:
+            method (str): Request method
+            path (str): Request path (without query string)
+
+        Returns:
+            tuple[Route, tuple, dict[str, Any]]|None: Route, pattern groups and converted path parameters or None if no route matches
+        """
+        if not self.__compiled:
+            self.compile()
+
+        best: int = self.__static.get((method, path))
+        groups: tuple = None
+        params: dict[str, Any] = None
+
+        trie = self.__tries.get(method)
+        if trie != None:
+            found = Router.__search(trie, path.split("/"), 0, [])
+            if found != None and (best == None or found[0] < best):
+                best, values = found
+                params = dict(zip(self.__routes[best].params, values))
+
+        if len(self.__combined) != 0:
+            segment = "/" + path.split("/", 2)[1] if path.startswith("/") else None
+            for key in ((method, segment), (method, None)):
+                combined = self.__combined.get(key)
+                if combined == None:
+                    continue
+
+                regex, offsets = combined
+                match = regex.match(path)
+                if match != None:
+                    index, start, count = offsets[match.lastindex]
+                    if best == None or index < best:
+                        best, params = index, None
+                        groups = match.groups()[start:start + count]
+
+        for index in self.__patterns.get(method, ()):
+            if best != None and index > best:
+                break
+
+            match = self.__routes[index].pattern.search(path)
+            if match != None:
+                best, params = index, None
+                groups = match.groups()
+                break
+
+        if best == None:
+            return None
+        return self.__routes[best], groups, params if params != None else {}
+
+    def __combine(self, indexes: list[int]) -> tuple[re.Pattern, list[tuple[int, int, int]]]:
+        """Combine anchored patterns into one alternation
+
+        Returns:
+            tuple[re.Pattern, list[tuple[int, int, int]]]: Pattern and (route index, first group, group count) by wrapper group number
+        """
+        parts = []
+        offsets = [None]
+        group = 1
+
+        for index in indexes:
+            pattern = self.__routes[index].pattern
+            parts.append(f"({pattern.pattern[1:]})")
+            offsets.append((index, group, pattern.groups))
+            offsets.extend([None] * pattern.groups)
+            group += pattern.groups + 1
+
+        return re.compile("|".join(parts)), offsets
+
+    @staticmethod
+    def __combinable(pattern: re.Pattern) -> bool:
+        """Check if a pattern can be part of a combined alternation"""
+        return (pattern.pattern.startswith("^")
+            and pattern.flags & ~re.UNICODE == 0
+            and "|" not in pattern.pattern
+            and re.search(r"\\\d|\(\?P=|\(\?[aiLmsux]", pattern.pattern) == None)
+
+    @staticmethod
+    def __first_segment(pattern: re.Pattern) -> str|None:
+        """Get the first path segment of a pattern if it's a literal (e.g. `"/files"` for `^/files/(.*)$`)"""
+        literal = re.match(r"\^(/[^.^$*+?{}\[\]\\|()/]*)([/$]?)", pattern.pattern)
+        if literal == None or literal.group(2) == "":
+            return None
+        return literal.group(1)
+
+    @staticmethod
+    def __search(node: Router.Node, segments: list[str], position: int, values: list[Any]) -> tuple[int, list[Any]]|None:
+        """Find the first registered route matching path segments
+
+        Returns:
+            tuple[int, list[Any]]|None: Route index and converted parameter values
+        """
+        if position == len(segments):
+            return (node.index, list(values)) if node.index != None else None
+
+        best = None
+        child = node.children.get(segments[position])
+        if child != None:
+            best = Router.__search(child, segments, position + 1, values)
+
+        for converter, child in node.params.items():
+            if converter == "path":
+                # rest of the path
+                segment = "/".join(segments[position:])
+                end = len(segments)
+            else:
+                segment = segments[position]
+                end = position + 1
+
+            try:
+                values.append(CONVERTERS[converter].parse(segment))
+            except ValueError:
+                continue
+
+            found = Router.__search(child, segments, end, values)
+            values.pop()
+            if found != None and (best == None or found[0] < best[0]):
+                best = found
+
+        return best
+
+    class Node:
+        """Segment trie node"""
+        def __init__(self) -> None:
+            self.children: dict[str, Router.Node] = {}
+            self.params: dict[str, Router.Node] = {}
+            self.index: int = None
@@ -1 +1,3 @@
-from luxon.http.server.httpserver import HttpServer
\ No newline at end of file
+from luxon.http.server.httpserver import HttpServer
+from luxon.http.server.asyncserver import AsyncHttpServer
+from luxon.http.connection import Connection
\ No newline at end of file
@@ -0,0 +1,389 @@
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from luxon.utils import Event
+from luxon.consts import *
+import socket
+import asyncio
+import inspect
+import threading
+import logging
+import signal
+from luxon.http.request import Request
+from luxon.http.response import Response
+from luxon.http.server.supervisor import Supervisor
+from luxon.http.connection import Connection
+from luxon.http.body import RequestBody
+
+logger = logging.getLogger(__name__)
+
+class AsyncHttpServer():
+    """HTTP server driven by an asyncio event loop\n
+    Idle connections don't occupy a thread. Request handlers may be coroutine
+    functions (awaited on the event loop) or return awaitables.
+    """
+    def __init__(self, threads: int = None, max_head_size: int = 65536, backlog: int = None, reuse_port: bool = False,
+                 keep_alive_timeout: float = 5.0, header_timeout: float = 10.0, max_requests: int = 1000, max_body_size: int = None,
+                 shutdown_timeout: float = 10.0):
+        """Create new asyncio HTTP server
+
+        Args:
+            threads (int, optional): Number of threads used to run blocking (plain) route handlers. Defaults to None (asyncio default).
+            max_head_size (int, optional): Max size of request line and headers in bytes. Defaults to 65536.
+            backlog (int, optional): Listen backlog. Defaults to None (system default).
+            reuse_port (bool, optional): Give every worker process it's own listening socket using `SO_REUSEPORT`. Defaults to `False`.
+            keep_alive_timeout (float, optional): Seconds an idle keep-alive connection is kept open. Defaults to 5.0.
+            header_timeout (float, optional): Seconds the client has to send the request line and headers. Defaults to 10.0.
+            max_requests (int, optional): Max number of requests per connection. Defaults to 1000.
+            max_body_size (int, optional): Max size of request body in bytes. Defaults to None (no limit).
+            shutdown_timeout (float, optional): Seconds in-flight requests get to finish when the server is stopped. Defaults to 10.0.
+        """
+        self.__on_request = Event()
+        self.__alive = True
+        self.__threads = threads
+        self.__max_head_size = max_head_size
+        self.__backlog = backlog
+        self.__loop: asyncio.AbstractEventLoop = None
+        self.__server: asyncio.AbstractServer = None
+        self.__reuse_port = reuse_port
+        self.__address: tuple[str, int] = None
+        self.__supervisor: Supervisor = None
+        self.__keep_alive_timeout = keep_alive_timeout
+        self.__header_timeout = header_timeout
+        self.__max_requests = max_requests
+        self.__max_body_size = max_body_size
+        self.__shutdown_timeout = shutdown_timeout
+        self.__active: set[asyncio.Task] = set()
+        self.__idle: set[asyncio.Task] = set()
+        self.__sock = self.__create_socket()
+
+    @property
+    def on_request(self):
+        """Request event handler"""
+        return self.__on_request
+
+    @on_request.setter
+    def on_request(self, value):
+        self.__on_request = value
+
+    def bind(self, server_address: tuple[str, int]):
+        """Bind Luxon HTTP server to specific address and port"""
+        self.__address = server_address
+        self.__sock.bind(server_address)
+
+    def start(self, workers: int = 1):
+        """Start Luxon HTTP server (blocks until the server is stopped)
+
+        Args:
+            workers (int, optional): Number of worker processes sharing the listening socket. 
+                Crashed workers are restarted. Defaults to 1 (serve in this process).
+        """
+        if workers > 1:
+            if not self.__reuse_port:
+                # workers inherit the listening socket
+                self.__listen()
+
+            self.__supervisor = Supervisor(workers, self.__run)
+            self.__supervisor.start()
+            self.stop()
+        else:
+            self.__listen()
+            self.__run()
+
+    def stop(self):
+        """Stop Luxon HTTP server\n
+        No new connections are accepted, idle keep-alive connections are closed and
+        requests being handled get `shutdown_timeout` seconds to finish.
+        """
+        self.__alive = False
+
+        if self.__supervisor != None:
+            self.__supervisor.stop()
+
+        if self.__loop != None and self.__server != None:
+            self.__loop.call_soon_threadsafe(self.__close)
+        else:
+            self.__sock.close()
+
+    def __close(self):
+        """Stop accepting connections and close idle ones (runs on the event loop)"""
+        self.__server.close()
+        for task in self.__idle:
+            task.cancel()
+
+    def __create_socket(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.__reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        return sock
+
+    def __listen(self):
+        if self.__backlog != None:
+            self.__sock.listen(self.__backlog)
+        else:
+            self.__sock.listen()
+
+    def __run(self):
+        if self.__supervisor != None and self.__reuse_port:
+            # worker process: bind own socket to the same address
+            self.__sock.close()
+            self.__sock = self.__create_socket()
+            self.__sock.bind(self.__address)
+            self.__listen()
+
+        try:
+            asyncio.run(self.__serve())
+        except KeyboardInterrupt:
+            self.stop()
+
+    async def __serve(self):
+        self.__loop = asyncio.get_running_loop()
+
+        if self.__threads != None:
+            self.__loop.set_default_executor(ThreadPoolExecutor(self.__threads))
+
+        self.__server = await asyncio.start_server(self.__accept, sock=self.__sock)
+
+        try:
+            # SIGTERM stops the server gracefully (only possible on the main thread)
+            self.__loop.add_signal_handler(signal.SIGTERM, self.stop)
+        except (ValueError, RuntimeError, NotImplementedError):
+            pass
+
+        async with self.__server:
+            try:
+                await self.__server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+            # let in-flight requests finish
+            self.__alive = False
+            self.__close()
+            if len(self.__active) != 0:
+                await asyncio.wait(set(self.__active), timeout=self.__shutdown_timeout)
+
+    async def __accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Accept incoming connection"""
+        address = writer.get_extra_info("peername")
+        sock = AsyncSocket(reader, writer, self.__loop)
+
+        # Log connection (stdout writes would block the event loop)
+        logger.debug("%s > New connection", address)
+
+        requests = 0
+        request: Request = None
+        response: Response = None
+
+        task = asyncio.current_task()
+        self.__active.add(task)
+
+        try:
+            while self.__alive:
+                # read request headers without blocking the event loop,
+                # stop() cancels connections that are idle between requests
+                self.__idle.add(task)
+                try:
+                    head = await asyncio.wait_for(sock.read_head(self.__max_head_size),
+                        self.__header_timeout if requests == 0 else self.__keep_alive_timeout)
+                except Connection.HeadTooLarge:
+                    self.__reject(sock, 431)
+                    break
+                finally:
+                    self.__idle.discard(task)
+
+                if head == None:
+                    break
+
+                requests += 1
+
+                try:
+                    # request and response objects are reused on keep-alive connections
+                    if request == None:
+                        request = Request(sock, head=head, max_body_size=self.__max_body_size)
+                    else:
+                        request.reset(head)
+                    # headers are parsed here so malformed ones get a 400
+                    keep_alive = request.keep_alive and requests < self.__max_requests
+                    body = request.body
+                except ValueError:
+                    self.__reject(sock, 400)
+                    break
+                except RequestBody.TooLarge:
+                    self.__reject(sock, 413)
+                    break
+
+                if response == None:
+                    response = Response(sock, request)
+                else:
+                    response.reset(request)
+
+                keep_alive = keep_alive and self.__alive
+                if not keep_alive:
+                    response.headers["Connection"] = "close"
+
+                # Log request
+                logger.debug("%s > %s %s", address, request.method, request.path)
+
+                # Call request event handler and wait for async handlers
+                try:
+                    for value in self.on_request(request, response):
+                        if inspect.isawaitable(value):
+                            await value
+                except RequestBody.TooLarge:
+                    if not response.headers_sent:
+                        self.__reject(sock, 413)
+                    break
+                except RequestBody.Invalid:
+                    if not response.headers_sent:
+                        self.__reject(sock, 400)
+                    break
+                except Exception:
+                    logger.exception("Error handling %s %s", request.method, request.path)
+                    if not response.headers_sent:
+                        self.__reject(sock, 500)
+                    break
+
+                response.end()
+                await writer.drain()
+
+                if not keep_alive or response.get_header("Connection") == "close":
+                    break
+
+                # skip the part of the body the handler didn't read
+                try:
+                    await asyncio.wait_for(body.discard_async(), self.__header_timeout)
+                except RequestBody.Invalid:
+                    # malformed chunked body
+                    break
+
+        except (OSError, asyncio.TimeoutError, asyncio.CancelledError):
+            # timeout, connection reset or server shutdown
+            pass
+        except Exception:
+            logger.exception("Unhandled error serving %s", address)
+        finally:
+            self.__active.discard(task)
+            writer.close()
+
+    def __reject(self, sock: AsyncSocket, code: int):
+        """Respond with an error status and close the connection"""
+        response = Response(sock)
+        response.status.code = code
+        response.headers["Connection"] = "close"
+        response.write_all(b"")
+
+class AsyncSocket:
+    """Socket-like wrapper around asyncio streams used by Request and Response\n
+    Writes from the event loop thread are buffered by the transport. Writes from
+    other threads (plain route handlers) block that thread until the data is flushed.
+    Coroutines wait for the data to be flushed with `sendall_async` and `sendfile_async`.
+    """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, loop: asyncio.AbstractEventLoop) -> None:
+        self.__reader = reader
+        self.__writer = writer
+        self.__loop = loop
+        self.__thread = threading.get_ident()
+        self.__buffer = bytearray()
+
+    @property
+    def reader(self) -> asyncio.StreamReader:
+        """Stream reader"""
+        return self.__reader
+
+    @property
+    def writer(self) -> asyncio.StreamWriter:
+        """Stream writer"""
+        return self.__writer
+
+    def sendall(self, data: bytes):
+        if threading.get_ident() == self.__thread:
+            self.__writer.write(data)
+        else:
+            asyncio.run_coroutine_threadsafe(self.sendall_async(data), self.__loop).result()
+
+    def send(self, data: bytes) -> int:
+        self.sendall(data)
+        return len(data)
+
+    @property
+    def blocking(self) -> bool:
+        """False on the event loop thread (blocking reads and file transfers aren't allowed)"""
+        return threading.get_ident() != self.__thread
+
+    def sendfile(self, file, offset: int = 0, count: int = None) -> int:
+        if not self.blocking:
+            # would buffer the whole file in the transport
+            raise Exception("Blocking file transfers are not allowed on the event loop thread")
+        return asyncio.run_coroutine_threadsafe(self.sendfile_async(file, offset, count), self.__loop).result()
+
+    async def sendall_async(self, data: bytes):
+        """Write data and wait until the transport buffer is flushed"""
+        self.__writer.write(data)
+        await self.__writer.drain()
+
+    async def sendfile_async(self, file, offset: int = 0, count: int = None) -> int:
+        """Send part of a file with `loop.sendfile` (zero-copy when the transport supports it)"""
+        await self.__writer.drain()
+        return await self.__loop.sendfile(self.__writer.transport, file, offset, count)
+
+    @property
+    def buffer(self) -> bytearray:
+        """Bytes received but not consumed yet"""
+        return self.__buffer
+
+    async def read_head(self, max_size: int) -> bytes|None:
+        """Read request line and headers
+
+        Args:
+            max_size (int): Max size of the request head in bytes
+
+        Raises:
+            Connection.HeadTooLarge: Request head is larger than `max_size`
+
+        Returns:
+            bytes|None: Request head or None if the client closed the connection
+        """
+        scanned = 0
+
+        while True:
+            head = Connection.take_head(self.__buffer, max_size, scanned)
+            if head != None:
+                return head
+
+            scanned = max(len(self.__buffer) - 3, 0)
+            if not await self.fill_async():
+                return None
+
+    def fill(self, size: int = BUFFER_SIZE) -> bool:
+        """Receive more data into the buffer (blocks the calling thread)
+
+        Returns:
+            bool: False if the client closed the connection
+        """
+        if not self.blocking:
+            raise Exception("Blocking reads are not allowed on the event loop thread")
+        return asyncio.run_coroutine_threadsafe(self.fill_async(size), self.__loop).result()
+
+    async def fill_async(self, size: int = BUFFER_SIZE) -> bool:
+        """Receive more data into the buffer
+
+        Returns:
+            bool: False if the client closed the connection
+        """
+        data = await self.__reader.read(size)
+        self.__buffer += data
+        return len(data) != 0
+
+    def recv(self, length: int) -> bytes:
+        if len(self.__buffer) == 0:
+            self.fill(length)
+
+        data = bytes(self.__buffer[:length])
+        del self.__buffer[:length]
+        return data
+
+    def close(self):
+        if threading.get_ident() == self.__thread:
+            self.__writer.close()
+        else:
+            self.__loop.call_soon_threadsafe(self.__writer.close)
@@ -5,15 +5,54 @@ from luxon.consts import *
 import socket
 import threading
 import ipaddress
+import queue
+import logging
 from luxon.http.request import Request
 from luxon.http.response import Response
+from luxon.http.body import RequestBody
+from luxon.http.server.supervisor import Supervisor
+from luxon.http.connection import Connection
+
+logger = logging.getLogger(__name__)
 
 class HttpServer():
-    def __init__(self):
+    def __init__(self, threads: int = None, queue_size: int = 64, backlog: int = None, reuse_port: bool = False,
+                 keep_alive_timeout: float = 5.0, header_timeout: float = 10.0, max_requests: int = 1000, max_head_size: int = 65536,
+                 max_body_size: int = None, shutdown_timeout: float = 10.0):
+        """Create new HTTP server
+
+        Args:
+            threads (int, optional): Number of worker threads. Defaults to None (new thread per connection).
+            queue_size (int, optional): Max number of accepted connections waiting for a worker thread. 
+                Connections are rejected with `503 Service Unavailable` when the queue is full. Defaults to 64.
+            backlog (int, optional): Listen backlog. Defaults to None (system default).
+            reuse_port (bool, optional): Give every worker process it's own listening socket using `SO_REUSEPORT`. Defaults to `False`.
+            keep_alive_timeout (float, optional): Seconds an idle keep-alive connection is kept open. Defaults to 5.0.
+            header_timeout (float, optional): Seconds the client has to send the request line and headers. Defaults to 10.0.
+            max_requests (int, optional): Max number of requests per connection. Defaults to 1000.
+            max_head_size (int, optional): Max size of request line and headers in bytes. Defaults to 65536.
+            max_body_size (int, optional): Max size of request body in bytes. Defaults to None (no limit).
+            shutdown_timeout (float, optional): Seconds in-flight requests get to finish when the server is stopped. Defaults to 10.0.
+        """
         self.__on_request = Event()
         self.__alive = True
-        self.__sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
-        self.__sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.__threads = threads
+        self.__backlog = backlog
+        self.__queue: queue.Queue[tuple[socket.socket, tuple[str, int]]|None] = queue.Queue(maxsize=queue_size) if threads != None else None
+        self.__workers: list[threading.Thread] = []
+        self.__reuse_port = reuse_port
+        self.__address: tuple[str, int] = None
+        self.__supervisor: Supervisor = None
+        self.__keep_alive_timeout = keep_alive_timeout
+        self.__header_timeout = header_timeout
+        self.__max_requests = max_requests
+        self.__max_head_size = max_head_size
+        self.__max_body_size = max_body_size
+        self.__shutdown_timeout = shutdown_timeout
+        self.__active = 0
+        self.__idle: set[socket.socket] = set()
+        self.__drained = threading.Condition()
+        self.__sock = self.__create_socket()
 
     @property
     def on_request(self):
@@ -26,24 +65,98 @@ class HttpServer():
 
     def bind(self, server_address: tuple[str, int]):
         """Bind Luxon HTTP server to specific address and port"""
+        self.__address = server_address
         self.__sock.bind(server_address)
 
-    def start(self):
-        """Start Luxon HTTP server"""
-        self.__sock.listen()
+    def start(self, workers: int = 1):
+        """Start Luxon HTTP server
+
+        Args:
+            workers (int, optional): Number of worker processes sharing the listening socket. 
+                Crashed workers are restarted. Defaults to 1 (serve in this process).
+        """
+        if workers > 1:
+            if not self.__reuse_port:
+                # workers inherit the listening socket
+                self.__listen()
+
+            self.__supervisor = Supervisor(workers, self.__serve)
+            self.__supervisor.start()
+            self.stop()
+        else:
+            self.__listen()
+            self.__serve()
+
+    def __create_socket(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.__reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        return sock
+
+    def __listen(self):
+        if self.__backlog != None:
+            self.__sock.listen(self.__backlog)
+        else:
+            self.__sock.listen()
+
+    def __serve(self):
+        if self.__supervisor != None and self.__reuse_port:
+            # worker process: bind own socket to the same address
+            self.__sock.close()
+            self.__sock = self.__create_socket()
+            self.__sock.bind(self.__address)
+            self.__listen()
+
+        if self.__queue != None:
+            # start worker pool
+            for _ in range(self.__threads):
+                thread = threading.Thread(target=self.__work, daemon=True)
+                thread.start()
+                self.__workers.append(thread)
+
         self.__start_accept()
+        self.__drain()
 
     def stop(self):
-        """Stop Luxon HTTP server"""
+        """Stop Luxon HTTP server\n
+        No new connections are accepted, idle keep-alive connections are closed and
+        requests being handled get `shutdown_timeout` seconds to finish.
+        """
         self.__alive = False
         self.__sock.close()
 
+        with self.__drained:
+            for sock in self.__idle:
+                try:
+                    sock.shutdown(socket.SHUT_RD)
+                except OSError:
+                    pass
+
+        if self.__supervisor != None:
+            self.__supervisor.stop()
+
+        # wake up idle workers
+        for _ in self.__workers:
+            try:
+                self.__queue.put_nowait(None)
+            except queue.Full:
+                break
+
     def __start_accept(self):
         try:
             while self.__alive:
                 # accept incoming connection
                 sock, address = self.__sock.accept()
 
+                if self.__queue != None:
+                    # hand accepted connection over to the worker pool
+                    try:
+                        self.__queue.put_nowait((sock, address))
+                    except queue.Full:
+                        self.__reject(sock)
+                    continue
+
                 # start a thread to handle accepted connection
                 thread = threading.Thread(target=self.__accept, args=(sock, address))
                 thread.start()
@@ -53,28 +166,141 @@ class HttpServer():
         except:
             pass
 
+    def __drain(self):
+        """Wait until connections that are being served are closed (up to the shutdown timeout)"""
+        with self.__drained:
+            self.__drained.wait_for(lambda: self.__active == 0, self.__shutdown_timeout)
+
+    def __work(self):
+        """Worker thread handling queued connections"""
+        while self.__alive:
+            item = self.__queue.get()
+            if item == None: break
+
+            sock, address = item
+            try:
+                self.__accept(sock, address)
+            except Exception:
+                # keep the worker alive whatever happens to one connection
+                logger.exception("Unhandled error serving %s", address)
+
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def __reject(self, sock: socket.socket, code: int = 503):
+        """Respond with an error status and close the connection (503 when all workers are busy and the queue is full)"""
+        try:
+            response = Response(sock)
+            response.status.code = code
+            response.headers["Connection"] = "close"
+            response.write_all(b"")
+        except OSError:
+            pass
+        finally:
+            sock.close()
+
     def __accept(self, sock: socket.socket, address: tuple[str, int]):
-        """Accept incoming connection"""
+        """Accept incoming connection and serve requests until it's closed"""
         # Log connection
         print(f"{address} > New connection")
 
+        connection = Connection(sock, address)
+        request: Request = None
+        response: Response = None
+
+        with self.__drained:
+            self.__active += 1
+
         try:
             while self.__alive:
-                # read request headers
-                request = Request(sock)
-                response = Response(sock)
+                # wait for the next (possibly pipelined) request, 
+                # stop() closes connections that are idle between requests
+                with self.__drained:
+                    if not self.__alive: break
+                    self.__idle.add(sock)
+
+                try:
+                    head = connection.read_head(self.__max_head_size,
+                        self.__header_timeout if connection.requests == 0 else self.__keep_alive_timeout, 
+                        self.__header_timeout)
+                except Connection.HeadTooLarge:
+                    self.__reject(sock, 431)
+                    break
+                finally:
+                    with self.__drained:
+                        self.__idle.discard(sock)
+
+                if head == None:
+                    break
+
+                try:
+                    # request and response objects are reused on keep-alive connections
+                    if request == None:
+                        request = Request(connection, head=head, max_body_size=self.__max_body_size)
+                    else:
+                        request.reset(head)
+                    # headers are parsed here so malformed ones get a 400
+                    keep_alive = request.keep_alive and connection.requests < self.__max_requests
+                    body = request.body
+                except ValueError:
+                    self.__reject(sock, 400)
+                    break
+                except RequestBody.TooLarge:
+                    self.__reject(sock, 413)
+                    break
+
+                if response == None:
+                    response = Response(connection, request)
+                else:
+                    response.reset(request)
+                connection.settimeout(self.__header_timeout)
+
+                keep_alive = keep_alive and self.__alive
+                if not keep_alive:
+                    response.headers["Connection"] = "close"
 
                 # Log request
                 print(f"{address} > {request.method} {request.path}")
 
                 # Call request event handler
-                self.on_request(request, response)
+                try:
+                    self.on_request(request, response)
+                except RequestBody.TooLarge:
+                    if not response.headers_sent:
+                        self.__reject(sock, 413)
+                    break
+                except RequestBody.Invalid:
+                    if not response.headers_sent:
+                        self.__reject(sock, 400)
+                    break
+                except Exception:
+                    logger.exception("Error handling %s %s", request.method, request.path)
+                    if not response.headers_sent:
+                        self.__reject(sock, 500)
+                    break
+
+                response.end()
 
-                # Close socket if 'Connection: close'
-                if "Connection" in request.headers and request.headers["Connection"] == "close":
-                    sock.close()
+                if not keep_alive or response.get_header("Connection") == "close":
+                    break
+
+                # skip the part of the body the handler didn't read
+                try:
+                    body.discard()
+                except RequestBody.Invalid:
+                    # malformed chunked body
+                    break
 
         except KeyboardInterrupt:
             self.stop()
-        except:
-            pass
\ No newline at end of file
+        except OSError:
+            # timeout or connection reset
+            pass
+        finally:
+            sock.close()
+
+            with self.__drained:
+                self.__active -= 1
+                self.__drained.notify_all()
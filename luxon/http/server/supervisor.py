@@ -0,0 +1,109 @@
+from __future__ import annotations
+from typing import Callable
+import os
+import sys
+import time
+import signal
+import traceback
+
+class Supervisor:
+    """Pre-fork process supervisor\n
+    Forks worker processes that run the same target, restarts workers that
+    exit while the supervisor is running and stops all of them on SIGINT or SIGTERM.
+    """
+    def __init__(self, workers: int, target: Callable[[], None], restart_delay: float = 1.0) -> None:
+        """Create new Supervisor
+
+        Args:
+            workers (int): Number of worker processes
+            target (Callable[[], None]): Function that is called in every worker process
+            restart_delay (float, optional): Delay before restarting a worker that crashed right after it was started. Defaults to 1.0.
+        """
+        if not hasattr(os, "fork"):
+            raise Exception("Pre-fork workers are not supported on this platform")
+
+        self.__workers = workers
+        self.__target = target
+        self.__restart_delay = restart_delay
+        self.__alive = True
+        self.__children: dict[int, float] = {} # pid -> start time
+
+    @property
+    def children(self) -> list[int]:
+        """Process IDs of running worker processes"""
+        return list(self.__children)
+
+    def start(self):
+        """Fork worker processes and supervise them until stopped (blocks)"""
+        previous = {
+            sig: signal.signal(sig, self.__handle_signal)
+            for sig in (signal.SIGINT, signal.SIGTERM)
+        }
+
+        try:
+            for _ in range(self.__workers):
+                self.__spawn()
+
+            while len(self.__children) != 0:
+                try:
+                    pid, status = os.wait()
+                except ChildProcessError:
+                    break
+                except InterruptedError:
+                    continue
+
+                started = self.__children.pop(pid, None)
+                if started == None or not self.__alive:
+                    continue
+
+                # Restart worker (slowly if it keeps crashing)
+                code = os.waitstatus_to_exitcode(status)
+                print(f"Worker {pid} exited with code {code}, restarting")
+                if time.monotonic() - started < self.__restart_delay:
+                    time.sleep(self.__restart_delay)
+                if self.__alive:
+                    self.__spawn()
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def stop(self):
+        """Stop all worker processes"""
+        self.__alive = False
+
+        for pid in list(self.__children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.__children.pop(pid, None)
+
+    def __handle_signal(self, signum, frame):
+        self.stop()
+
+    def __spawn(self):
+        pid = os.fork()
+
+        if pid != 0:
+            # Parent process
+            self.__children[pid] = time.monotonic()
+            return
+
+        # Worker process: SIGTERM and SIGINT stop the server like Ctrl+C,
+        # the target returns once in-flight requests are finished
+        self.__alive = False
+        self.__children = {}
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+        code = 0
+        try:
+            self.__target()
+        except KeyboardInterrupt:
+            pass
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
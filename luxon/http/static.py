@@ -0,0 +1,152 @@
+from __future__ import annotations
+from collections import OrderedDict
+from email.utils import formatdate
+import os
+import mimetypes
+import threading
+from luxon.http.request import Request
+from luxon.http.response import Response
+from luxon.http.compression import Compression
+from luxon.http.headers import AcceptEncodingHeader
+
+class StaticFiles:
+    """Static file handler with an in-memory LRU cache\n
+    Small files are kept in memory together with their compressed variants
+    and served without reading the disk. Cached files are invalidated when their
+    size or modification time changes. Larger files are sent with `Response.send_file`.
+    """
+    def __init__(self, directory: str, cache_size: int = 32 * 1024 * 1024, max_file_size: int = 1024 * 1024, index: str = "index.html"):
+        """Create new StaticFiles handler
+
+        Args:
+            directory (str): Directory to serve files from
+            cache_size (int, optional): Max cache size in bytes (all variants included). Defaults to 32 MiB.
+            max_file_size (int, optional): Max size of a cached file in bytes. Defaults to 1 MiB.
+            index (str, optional): File served for directories. Defaults to `"index.html"`.
+        """
+        self.__directory = os.path.realpath(directory)
+        self.__cache_size = cache_size
+        self.__max_file_size = max_file_size
+        self.__index = index
+        self.__cache: OrderedDict[str, StaticFiles.Entry] = OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        """Directory files are served from"""
+        return self.__directory
+
+    @property
+    def size(self) -> int:
+        """Current cache size in bytes"""
+        return self.__size
+
+    def __call__(self, request: Request, response: Response):
+        """Serve the file matching the first path group of the request"""
+        path = self.__resolve(request.groups[0] if request.groups else "")
+
+        if path == None:
+            response.status.code = 404
+            response.write_all(b"Not Found")
+            return
+
+        stat = os.stat(path)
+
+        if stat.st_size > self.__max_file_size or request.get_header("Range") != None:
+            response.send_file(path)
+            return
+
+        entry = self.__get(path, stat)
+
+        # Select variant
+        encoding = None
+        accept_encoding = request.get_header("Accept-Encoding")
+        if accept_encoding != None and len(entry.variants) != 0:
+            encoding = AcceptEncodingHeader.parse(accept_encoding).select(*entry.variants, "identity")
+            if encoding == "identity": encoding = None
+
+        etag = entry.etag if encoding == None else f'{entry.etag[:-1]}-{encoding}"'
+
+        response.headers["Content-Type"] = entry.content_type
+        response.headers["ETag"] = etag
+        response.headers["Last-Modified"] = entry.last_modified
+        if len(entry.variants) != 0:
+            response.headers["Vary"] = "Accept-Encoding"
+
+        if request.not_modified(etag, entry.mtime):
+            response.status.code = 304
+            del response.headers["Content-Type"]
+            response.send_headers()
+            return
+
+        body = entry.data if encoding == None else entry.variants[encoding]
+        if encoding != None:
+            response.headers["Content-Encoding"] = encoding
+
+        if request.method == "HEAD":
+            response.headers["Content-Length"] = len(body)
+            response.send_headers()
+        else:
+            response.write_all(body)
+
+    def __resolve(self, name: str) -> str|None:
+        """Get path to file inside the served directory"""
+        path = os.path.realpath(os.path.join(self.__directory, name.lstrip("/")))
+
+        if path != self.__directory and not path.startswith(self.__directory + os.sep):
+            return None
+
+        if os.path.isdir(path):
+            path = os.path.join(path, self.__index)
+
+        return path if os.path.isfile(path) else None
+
+    def __get(self, path: str, stat: os.stat_result) -> StaticFiles.Entry:
+        """Get file from the cache or load it"""
+        with self.__lock:
+            entry = self.__cache.get(path)
+
+            if entry != None and entry.mtime_ns == stat.st_mtime_ns and len(entry.data) == stat.st_size:
+                self.__cache.move_to_end(path)
+                return entry
+
+        entry = StaticFiles.Entry(path, stat)
+
+        with self.__lock:
+            old = self.__cache.pop(path, None)
+            if old != None: self.__size -= old.size
+
+            if entry.size <= self.__cache_size:
+                self.__cache[path] = entry
+                self.__size += entry.size
+
+                # Evict least recently used files
+                while self.__size > self.__cache_size:
+                    _, evicted = self.__cache.popitem(last=False)
+                    self.__size -= evicted.size
+
+        return entry
+
+    class Entry:
+        """Cached file and it's compressed variants"""
+        def __init__(self, path: str, stat: os.stat_result) -> None:
+            with open(path, "rb") as f:
+                self.data: bytes = f.read()
+
+            type, encoding = mimetypes.guess_type(path)
+            self.content_type: str = type if type != None else "application/octet-stream"
+            self.mtime: float = stat.st_mtime
+            self.mtime_ns: int = stat.st_mtime_ns
+            self.etag: str = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            self.last_modified: str = formatdate(stat.st_mtime, usegmt=True)
+            self.variants: dict[str, bytes] = {}
+
+            if Compression.compressible(self.content_type):
+                for encoding in Compression.encodings():
+                    if encoding == "deflate": continue
+                    compressed = Compression.compress(self.data, encoding, level=9)
+                    if len(compressed) < len(self.data):
+                        self.variants[encoding] = compressed
+
+            self.size: int = len(self.data) + sum(len(v) for v in self.variants.values())
@@ -27,8 +27,10 @@ class Event:
         self.remove(other)
         return self
 
-    def __call__(self, *args, **kwargs):
+    def __call__(self, *args, **kwargs) -> list:
         """Call this instance like a function to fire all event handlers
+
+        Returns:
+            list: Return values of the event handlers
         """
-        for handler in self.__events:
-            handler(*args, **kwargs)
\ No newline at end of file
+        return [handler(*args, **kwargs) for handler in self.__events]
\ No newline at end of file
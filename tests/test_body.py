@@ -0,0 +1,68 @@
+import socket
+import threading
+import time
+import unittest
+from luxon.http import App, HttpServer, AsyncHttpServer, RequestBody
+from luxon.http.headers import Headers
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class Buffer:
+    """Connection with all input already received"""
+    def __init__(self, data: bytes) -> None:
+        self.buffer = bytearray(data)
+
+    def fill(self) -> bool:
+        return False
+
+def chunked(data: bytes) -> RequestBody:
+    return RequestBody(Buffer(data), Headers([("Transfer-Encoding", "chunked")]))
+
+class ChunkedBodyTest(unittest.TestCase):
+    def test_valid(self):
+        self.assertEqual(chunked(b"5\r\nhello\r\n1 ;ext=1\r\n!\r\n0\r\nX-Trailer: 1\r\n\r\n").read(), b"hello!")
+
+    def test_invalid(self):
+        for data in (b"zz\r\nhello\r\n0\r\n\r\n", b"+5\r\nhello\r\n0\r\n\r\n", b" 5\r\nhello\r\n0\r\n\r\n", b"5\r\nhelloXX0\r\n\r\n"):
+            with self.assertRaises(RequestBody.Invalid, msg=data):
+                chunked(data).read()
+
+    def test_invalid_headers(self):
+        with self.assertRaises(RequestBody.Invalid):
+            RequestBody(Buffer(b""), Headers([("Content-Length", "-1")]))
+        with self.assertRaises(RequestBody.Invalid):
+            RequestBody(Buffer(b""), Headers([("Transfer-Encoding", "gzip")]))
+
+class InvalidBodyStatusTest(unittest.TestCase):
+    REQUEST = b"POST / HTTP/1.1\r\nHost: x\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\nhello\r\n0\r\n\r\n"
+
+    def serve(self, server: HttpServer|AsyncHttpServer) -> int:
+        app = App(server=server)
+
+        @app.route("POST", "/")
+        def echo(request, response):
+            return request.content()
+
+        port = free_port()
+        threading.Thread(target=app.start, args=(("127.0.0.1", port),), daemon=True).start()
+        time.sleep(0.3)
+        self.addCleanup(server.stop)
+        return port
+
+    def status(self, port: int) -> bytes:
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.settimeout(5)
+            sock.sendall(InvalidBodyStatusTest.REQUEST)
+            return sock.recv(65536).split(b"\r\n")[0]
+
+    def test_threaded(self):
+        self.assertEqual(self.status(self.serve(HttpServer())), b"HTTP/1.1 400 Bad Request")
+
+    def test_async(self):
+        self.assertEqual(self.status(self.serve(AsyncHttpServer())), b"HTTP/1.1 400 Bad Request")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+from luxon.http import Response, ResponseCache
+
+class CacheableTest(unittest.TestCase):
+    def test_plain_response(self):
+        response = Response(None)
+        self.assertTrue(ResponseCache.cacheable(response))
+
+    def test_status(self):
+        response = Response(None)
+        response.status.code = 404
+        self.assertFalse(ResponseCache.cacheable(response))
+
+    def test_set_cookie(self):
+        for name in ("Set-Cookie", "set-cookie", "SET-COOKIE"):
+            response = Response(None)
+            response.headers[name] = "session=1"
+            self.assertFalse(ResponseCache.cacheable(response), name)
+
+    def test_cache_control(self):
+        for name in ("Cache-Control", "cache-control"):
+            for value in ("private", "no-store", "max-age=60, Private", 'private="Set-Cookie"'):
+                response = Response(None)
+                response.headers[name] = value
+                self.assertFalse(ResponseCache.cacheable(response), f"{name}: {value}")
+
+        response = Response(None)
+        response.headers["cache-control"] = "public, max-age=60"
+        self.assertTrue(ResponseCache.cacheable(response))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import socket
+import threading
+import time
+import unittest
+from luxon.http import App, HttpServer, AsyncHttpServer, Request
+from luxon.http.connection import Connection
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class TakeHeadTest(unittest.TestCase):
+    def take(self, data: bytes, max_size: int = 1024) -> tuple[bytes|None, bytes]:
+        buffer = bytearray(data)
+        return Connection.take_head(buffer, max_size), bytes(buffer)
+
+    def test_crlf(self):
+        self.assertEqual(self.take(b"GET / HTTP/1.1\r\nHost: x\r\n\r\nbody"), (b"GET / HTTP/1.1\r\nHost: x\r\n\r\n", b"body"))
+
+    def test_bare_lf(self):
+        self.assertEqual(self.take(b"GET / HTTP/1.1\nHost: x\n\nbody"), (b"GET / HTTP/1.1\nHost: x\n\n", b"body"))
+        self.assertEqual(self.take(b"GET / HTTP/1.1\r\nHost: x\n\r\nbody"), (b"GET / HTTP/1.1\r\nHost: x\n\r\n", b"body"))
+        self.assertEqual(self.take(b"GET / HTTP/1.1\r\nHost: x\r\n\nbody"), (b"GET / HTTP/1.1\r\nHost: x\r\n\n", b"body"))
+
+    def test_first_empty_line(self):
+        # the body may contain an empty line of the other kind
+        self.assertEqual(self.take(b"GET / HTTP/1.1\nHost: x\n\nbody\r\n\r\n"), (b"GET / HTTP/1.1\nHost: x\n\n", b"body\r\n\r\n"))
+        self.assertEqual(self.take(b"GET / HTTP/1.1\r\nHost: x\r\n\r\nbody\n\n"), (b"GET / HTTP/1.1\r\nHost: x\r\n\r\n", b"body\n\n"))
+
+    def test_incomplete(self):
+        self.assertEqual(self.take(b"GET / HTTP/1.1\nHost: x\n"), (None, b"GET / HTTP/1.1\nHost: x\n"))
+
+    def test_leading_empty_lines(self):
+        self.assertEqual(self.take(b"\r\n\n\r\nGET / HTTP/1.1\n\n"), (b"GET / HTTP/1.1\n\n", b""))
+
+    def test_too_large(self):
+        with self.assertRaises(Connection.HeadTooLarge):
+            self.take(b"GET / HTTP/1.1\nHost: x\n\n", 10)
+
+    def test_request(self):
+        request = Request(None, head=b"GET /a?b=1 HTTP/1.1\nHost: x\nX-Value: 1\n\n")
+        self.assertEqual((request.method, request.path, request.version), ("GET", "/a", "HTTP/1.1"))
+        self.assertEqual(request.query, {"b": "1"})
+        self.assertEqual(request.get_header("x-value"), "1")
+
+class BareLineFeedTest(unittest.TestCase):
+    def serve(self, server: HttpServer|AsyncHttpServer) -> int:
+        app = App(server=server)
+
+        @app.route("GET", "/")
+        def index(request, response):
+            return request.get_header("Host")
+
+        port = free_port()
+        threading.Thread(target=app.start, args=(("127.0.0.1", port),), daemon=True).start()
+        time.sleep(0.3)
+        self.addCleanup(server.stop)
+        return port
+
+    def get(self, port: int) -> bytes:
+        with socket.create_connection(("127.0.0.1", port)) as sock:
+            sock.settimeout(5)
+            sock.sendall(b"GET / HTTP/1.1\nHost: x\nConnection: close\n\n")
+            data = b""
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk: break
+                data += chunk
+            return data
+
+    def test_threaded(self):
+        data = self.get(self.serve(HttpServer()))
+        self.assertTrue(data.startswith(b"HTTP/1.1 200"), data)
+        self.assertTrue(data.endswith(b"\r\n\r\nx"), data)
+
+    def test_async(self):
+        data = self.get(self.serve(AsyncHttpServer()))
+        self.assertTrue(data.startswith(b"HTTP/1.1 200"), data)
+        self.assertTrue(data.endswith(b"\r\n\r\nx"), data)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from luxon.html import *
+
+HTML = "<html><body>" + "".join(
+    f"<div id='d{i}' class='c{i % 3} x' data-k='{i % 2}'><p class='c{i % 2}'>t{i}<span id='s{i}'>q</span></p></div>"
+    for i in range(20)) + "</body></html>"
+
+class DocumentIndexTest(unittest.TestCase):
+    """Indexed lookups return the same elements as walking the tree"""
+    def setUp(self):
+        self.plain = Parser.parse(HTML)
+        self.indexed = Parser.parse(HTML, index=True)
+
+    def assertSame(self, lookup):
+        self.assertEqual([str(tag) for tag in lookup(self.plain)], [str(tag) for tag in lookup(self.indexed)])
+
+    def assertSameOne(self, lookup):
+        self.assertEqual(str(lookup(self.plain)), str(lookup(self.indexed)))
+
+    def test_by_class(self):
+        for names in (("c0",), ("c1",), ("x",), ("c2", "x"), ("missing",), ("c0", "missing")):
+            self.assertSame(lambda root: root.find_all_by_class(*names))
+            self.assertSameOne(lambda root: root.find_by_class(*names))
+
+    def test_by_class_without_names(self):
+        self.assertSame(lambda root: root.find_all_by_class())
+        self.assertSameOne(lambda root: root.find_by_class())
+        self.assertSame(lambda root: root.find_by_id("d3").find_all_by_class())
+
+    def test_by_tagname(self):
+        for name in ("div", "p", "span", "missing"):
+            self.assertSame(lambda root: root.find_all_by_tagname(name))
+            self.assertSameOne(lambda root: root.find_by_tagname(name))
+
+    def test_by_attribute(self):
+        self.assertSame(lambda root: root.find_all_by_attribute("data-k", "1"))
+        self.assertSame(lambda root: root.find_all_by_attribute("data-k"))
+
+    def test_subtree(self):
+        self.assertSame(lambda root: root.find_by_id("d3").find_all_by_tagname("span"))
+        self.assertSame(lambda root: root.find_by_id("d4").find_all_by_class("c0"))
+
+    def test_after_changes(self):
+        for root in (self.plain, self.indexed):
+            body = root.find_by_tagname("body")
+            del body[0:3]
+            body.add(Div().set_id("new").add_class("c1"))
+            body[2].add_class("zz")
+            body.insert(0, Span("hi").set_id("s3"))
+
+        self.assertSame(lambda root: root.find_all_by_class("c1"))
+        self.assertSame(lambda root: root.find_all_by_class("zz"))
+        self.assertSameOne(lambda root: root.find_by_id("s3"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from luxon.http import Request, Response
+
+class Client:
+    """Socket that records the response"""
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def sendall(self, data: bytes):
+        self.data += data
+
+class RangeTest(unittest.TestCase):
+    def send(self, content: bytes, range: str) -> bytes:
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+
+        client = Client()
+        request = Request(None, head=f"GET / HTTP/1.1\r\nHost: x\r\nRange: {range}\r\n\r\n".encode())
+        Response(client, request).send_file(path)
+        return bytes(client.data)
+
+    def test_suffix(self):
+        data = self.send(b"0123456789", "bytes=-3")
+        self.assertTrue(data.startswith(b"HTTP/1.1 206"), data)
+        self.assertIn(b"Content-Range: bytes 7-9/10\r\n", data)
+        self.assertTrue(data.endswith(b"\r\n\r\n789"), data)
+
+    def test_suffix_longer_than_file(self):
+        data = self.send(b"0123456789", "bytes=-20")
+        self.assertIn(b"Content-Range: bytes 0-9/10\r\n", data)
+        self.assertTrue(data.endswith(b"\r\n\r\n0123456789"), data)
+
+    def test_empty_file(self):
+        for range in ("bytes=-5", "bytes=0-", "bytes=0-0", "bytes=-5, 0-"):
+            data = self.send(b"", range)
+            self.assertTrue(data.startswith(b"HTTP/1.1 416"), data)
+            self.assertIn(b"Content-Range: bytes */0\r\n", data)
+
+    def test_unsatisfiable_part_skipped(self):
+        data = self.send(b"0123456789", "bytes=20-, -2")
+        self.assertIn(b"Content-Range: bytes 8-9/10\r\n", data)
+        self.assertTrue(data.endswith(b"\r\n\r\n89"), data)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from luxon.http import App, AsyncHttpServer
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class AsyncSendFileTest(unittest.TestCase):
+    SIZE = 64 * 1024 * 1024
+
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(os.urandom(1024 * 1024) * (cls.SIZE // (1024 * 1024)))
+
+        cls.sent = threading.Event()
+        cls.app = App(server=AsyncHttpServer())
+
+        @cls.app.route("GET", "/async")
+        async def send_async(request, response):
+            await response.send_file_async(cls.path)
+            cls.sent.set()
+
+        @cls.app.route("GET", "/plain")
+        def send(request, response):
+            response.send_file(cls.path)
+
+        cls.port = free_port()
+        threading.Thread(target=cls.app.start, args=(("127.0.0.1", cls.port),), daemon=True).start()
+        time.sleep(0.3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.app.server.stop()
+        os.remove(cls.path)
+
+    def get(self, path: str, extra: str = "") -> socket.socket:
+        sock = socket.create_connection(("127.0.0.1", self.port))
+        sock.settimeout(10)
+        sock.sendall(f"GET {path} HTTP/1.1\r\nHost: x\r\n{extra}Connection: close\r\n\r\n".encode())
+        return sock
+
+    def read(self, sock: socket.socket) -> tuple[bytes, bytes]:
+        data = bytearray()
+        while True:
+            chunk = sock.recv(1024 * 1024)
+            if not chunk: break
+            data += chunk
+        sock.close()
+        head, _, body = bytes(data).partition(b"\r\n\r\n")
+        return head, body
+
+    def expected(self, offset: int = 0, count: int = None) -> bytes:
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return f.read(count if count != None else -1)
+
+    def test_large_file(self):
+        self.sent.clear()
+        sock = self.get("/async")
+
+        # the client isn't reading, the handler waits instead of buffering the file
+        time.sleep(0.5)
+        self.assertFalse(self.sent.is_set())
+
+        head, body = self.read(sock)
+        self.assertTrue(head.startswith(b"HTTP/1.1 200"), head)
+        self.assertEqual(len(body), self.SIZE)
+        self.assertTrue(body == self.expected())
+        self.assertTrue(self.sent.wait(5))
+
+    def test_ranges(self):
+        head, body = self.read(self.get("/async", "Range: bytes=10-19\r\n"))
+        self.assertTrue(head.startswith(b"HTTP/1.1 206"), head)
+        self.assertEqual(body, self.expected(10, 10))
+
+        head, body = self.read(self.get("/async", "Range: bytes=0-4, -5\r\n"))
+        self.assertTrue(head.startswith(b"HTTP/1.1 206"), head)
+        self.assertIn(self.expected(0, 5), body)
+        self.assertIn(self.expected(self.SIZE - 5), body)
+
+    def test_plain_handler(self):
+        head, body = self.read(self.get("/plain", "Range: bytes=-100\r\n"))
+        self.assertTrue(head.startswith(b"HTTP/1.1 206"), head)
+        self.assertEqual(body, self.expected(self.SIZE - 100))
+
+if __name__ == "__main__":
+    unittest.main()